@@ -0,0 +1,227 @@
+"""
+Benchmarks of generating, saving and loading sweeps of synthetic configs.
+
+Every scenario builds a Pydantic config of a given shape (nesting depth, fields per level, size of a list payload)
+with a ``Union[int, str]`` field, varies a deeply nested field and the union field into a grid of the given size
+and measures each stage twice: the best wall time of several repeats, and the peak memory of one extra run
+traced with :mod:`tracemalloc` (Python allocations of the main process only).
+
+    python benchmarks/run.py --quick                      # seconds, for a local check
+    python benchmarks/run.py --full -o results/0.0.1.json  # up to 10^6 variants
+    python benchmarks/run.py --quick --compare results/0.0.1.json
+
+Results are written as JSON; ``--compare`` prints the ratios to an earlier result file and exits with status 1
+if a stage got slower than ``--threshold``.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, create_model
+
+import expergen
+
+# name -> (nesting depth, int fields per level, floats in the payload list)
+SHAPES = {
+    "flat": (1, 4, 0),
+    "deep": (8, 2, 0),
+    "wide": (2, 64, 0),
+    "payload": (2, 4, 1000),
+}
+
+MODES = {
+    "quick": {"sizes": [10, 1_000], "max_io": 1_000, "repeats": 3},
+    "full": {"sizes": [10, 1_000, 10_000, 100_000, 1_000_000], "max_io": 100_000, "repeats": 5},
+}
+
+STAGES = ("generate", "save_to_directory", "load_from_json", "load_from_directory")
+
+
+def make_config(depth: int, width: int, payload: int) -> BaseModel:
+    """
+    Build an instance of a synthetic config model nested ``depth`` levels deep.
+    """
+    child = None
+    for level in reversed(range(depth)):
+        fields: Dict[str, Any] = {f"x{i}": (int, i) for i in range(width)}
+        fields["choice"] = (Union[int, str], 0)
+        if child is None:
+            fields["payload"] = (List[float], [0.5] * payload)
+        else:
+            fields["child"] = (type(child), child)
+        child = create_model(f"Level{level}", **fields)()
+    return child
+
+
+def make_variations(depth: int, size: int) -> Dict[str, list]:
+    """
+    Vary the deepest ``x0`` and the top-level union field into a grid of exactly ``size`` combinations.
+    The deep axis gets the largest divisor of ``size`` up to about its square root (rounded up to a power of ten).
+    """
+    if size < 1:
+        raise ValueError(f"Grid size must be positive, got {size}")
+    target = 10 ** math.ceil(math.log10(size) / 2)
+    deep_size = max(d for d in range(1, min(size, target) + 1) if size % d == 0)
+    choice_size = size // deep_size
+    return {
+        ".".join(["child"] * (depth - 1) + ["x0"]): list(range(deep_size)),
+        "choice": [i if i % 2 else f"option_{i}" for i in range(choice_size)],
+    }
+
+
+def measure(function: Callable[[], Any], repeats: int, setup: Callable[[], None] = None) -> Tuple[float, int]:
+    """
+    :return: Best wall time of ``repeats`` runs in seconds and the peak traced memory of one more run in bytes.
+    """
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def run_scenario(shape: str, size: int, max_io: int, repeats: int) -> List[Dict[str, Any]]:
+    depth, width, payload = SHAPES[shape]
+    base = make_config(depth, width, payload)
+    variations = make_variations(depth, size)
+    assert math.prod(len(values) for values in variations.values()) == size
+    model_type: Type[BaseModel] = type(base)
+    # Large grids are measured with a single run; building them dominates the suite's duration.
+    repeats = repeats if size <= 10_000 else 1
+    results = []
+
+    def record(stage: str, seconds: float, peak: int) -> None:
+        results.append({"shape": shape, "variants": size, "stage": stage, "seconds": seconds, "peak_bytes": peak})
+        print(f"{shape:>8} {size:>9} {stage:<20} {seconds * 1000:12.2f} ms {peak / 2 ** 20:10.2f} MiB", flush=True)
+
+    def generate():
+        for _ in expergen.generate_variations(base, variations):
+            pass
+
+    record("generate", *measure(generate, repeats))
+    if size > max_io:
+        return results
+
+    with tempfile.TemporaryDirectory() as directory:
+        def clear():
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+
+        def save():
+            with contextlib.redirect_stdout(io.StringIO()):
+                expergen.save_to_directory(expergen.generate_variations(base, variations), directory)
+
+        record("save_to_directory", *measure(save, repeats, setup=clear))
+        paths = [os.path.join(directory, filename) for filename in os.listdir(directory)]
+
+        def load_files():
+            for path in paths:
+                expergen.load_from_json(path, model_type)
+
+        record("load_from_json", *measure(load_files, repeats))
+        record("load_from_directory", *measure(lambda: expergen.load_from_directory(directory, model_type), repeats))
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "expergen": metadata.version("expergen"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """
+    Print the time and memory ratios to a baseline result file.
+
+    :return: True if no stage got slower than ``threshold`` times the baseline.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["shape"], r["variants"], r["stage"]): r for r in json.load(f)["results"]}
+    passed = True
+    print(f"\nCompared to {baseline_path}:")
+    for result in results:
+        old = baseline.get((result["shape"], result["variants"], result["stage"]))
+        if old is None:
+            continue
+        time_ratio = result["seconds"] / old["seconds"] if old["seconds"] else math.inf
+        memory_ratio = result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else math.inf
+        slower = time_ratio > threshold
+        passed &= not slower
+        print(f"{result['shape']:>8} {result['variants']:>9} {result['stage']:<20} "
+              f"time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}{'  REGRESSION' if slower else ''}")
+    return passed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--quick", dest="mode", action="store_const", const="quick", help="small grids (default)")
+    mode.add_argument("--full", dest="mode", action="store_const", const="full", help="grids up to 10^6 variants")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=int, help="override the grid sizes of the mode (exact numbers of variants)")
+    parser.add_argument("--max-io", type=int, help="largest grid that is saved and loaded (generation runs for all sizes)")
+    parser.add_argument("--repeats", type=int, help="timed runs per stage; the best one is reported")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="time ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    settings = MODES[args.mode or "quick"]
+    sizes = args.sizes or settings["sizes"]
+    max_io = args.max_io if args.max_io is not None else settings["max_io"]
+    repeats = args.repeats or settings["repeats"]
+    if any(size < 1 for size in sizes):
+        parser.error("argument --sizes: grid sizes must be positive")
+
+    print(f"{'shape':>8} {'variants':>9} {'stage':<20} {'time':>15} {'peak memory':>14}")
+    results = []
+    for shape in args.shapes:
+        for size in sizes:
+            results.extend(run_scenario(shape, size, max_io, repeats))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({"environment": environment(), "mode": args.mode or "quick", "results": results}, f, indent=4)
+        print(f"Saved results to '{args.output}'.")
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,66 @@
-from .base_classes import ExpergenModelConfig, ExpergenModel
-from .dataclass_utils import generate_variations
-from .json_utils import save_to_directory, load_from_json, load_from_directory
-__all__ = ["generate_variations", "save_to_directory", "load_from_json", "load_from_directory"]
\ No newline at end of file
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it. Submodules (and pydantic/numpy) are imported on first attribute access,
+# so ``import expergen`` and the command line stay fast.
+_EXPORTS = {
+    "ExpergenModelConfig": "base_classes", "ExpergenModel": "base_classes",
+    "generate_variations": "dataclass_utils", "VariationSpace": "dataclass_utils",
+    "save_to_directory": "json_utils", "generate_and_save": "json_utils", "load_from_json": "json_utils",
+    "load_from_directory": "json_utils", "iter_from_directory": "json_utils",
+    "save_to_store": "store_utils", "open_store": "store_utils", "convert_directory_to_store": "store_utils", "ConfigStore": "store_utils",
+    "save_deltas": "delta_utils", "open_deltas": "delta_utils", "load_deltas": "delta_utils",
+    "sample_variations": "sampling_utils", "Uniform": "sampling_utils",
+    "config_hash": "hash_utils", "iter_unique": "hash_utils",
+    "sync_directory": "sync_utils", "SyncReport": "sync_utils",
+    "shard_from_env": "shard_utils",
+    "ConfigFrame": "frame_utils",
+    "query_directory": "index_utils",
+    "Profiler": "profile_utils",
+    "ModelCache": "cache_utils",
+    "SerializationFormat": "format_utils", "register_format": "format_utils",
+    "async_save_to_directory": "async_utils", "async_load_from_directory": "async_utils", "async_iter_from_directory": "async_utils",
+    "async_save_to_stream": "async_utils", "async_iter_from_stream": "async_utils",
+}
+
+__all__ = ["generate_variations", "VariationSpace", "save_to_directory", "generate_and_save", "load_from_json", "load_from_directory", "iter_from_directory",
+           "save_to_store", "open_store", "convert_directory_to_store", "ConfigStore",
+           "save_deltas", "open_deltas", "load_deltas",
+           "sample_variations", "Uniform", "config_hash", "iter_unique",
+           "sync_directory", "SyncReport", "shard_from_env", "ConfigFrame", "query_directory", "Profiler", "ModelCache", "SerializationFormat", "register_format",
+           "async_save_to_directory", "async_load_from_directory", "async_iter_from_directory", "async_save_to_stream", "async_iter_from_stream"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        # Submodules (``expergen.json_utils``) are attributes once imported; import them on first access.
+        if importlib.util.find_spec(f".{name}", __name__) is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        return importlib.import_module(f".{name}", __name__)
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
+
+
+if TYPE_CHECKING:
+    from .base_classes import ExpergenModelConfig, ExpergenModel
+    from .dataclass_utils import generate_variations, VariationSpace
+    from .json_utils import save_to_directory, generate_and_save, load_from_json, load_from_directory, iter_from_directory
+    from .store_utils import save_to_store, open_store, convert_directory_to_store, ConfigStore
+    from .delta_utils import save_deltas, open_deltas, load_deltas
+    from .sampling_utils import sample_variations, Uniform
+    from .hash_utils import config_hash, iter_unique
+    from .sync_utils import sync_directory, SyncReport
+    from .shard_utils import shard_from_env
+    from .frame_utils import ConfigFrame
+    from .index_utils import query_directory
+    from .profile_utils import Profiler
+    from .cache_utils import ModelCache
+    from .format_utils import SerializationFormat, register_format
+    from .async_utils import async_save_to_directory, async_load_from_directory, async_iter_from_directory, async_save_to_stream, async_iter_from_stream
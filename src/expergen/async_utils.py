@@ -0,0 +1,210 @@
+import os
+import asyncio
+import inspect
+import collections.abc
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Set, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from .json_utils import NAMING_SCHEMES, _dump_instance, _save_instance, _validate_json, list_instance_files, load_from_json
+from .format_utils import get_format
+from .shard_utils import shard_range
+
+T = TypeVar('T', bound=BaseModel)
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def async_save_to_directory(instances: Union[Iterable[T], AsyncIterable[T]], destination_dir: str, exclude_defaults = True, concurrency: int = DEFAULT_CONCURRENCY, naming: str = "index", format: str = "json") -> None:
+    """
+    Asynchronous :func:`~expergen.json_utils.save_to_directory`: serialization and file writes run in threads,
+    so the event loop stays responsive. At most ``concurrency`` files are in flight; further instances are not
+    taken from ``instances`` until one of them is written (backpressure on async producers).
+
+    Instances of a sequence (e.g. a :class:`~expergen.dataclass_utils.VariationSpace`) are also built in the threads.
+
+    :param instances: Iterable or async iterable of instances (Pydantic models or dataclasses).
+    :param destination_dir: Path to the directory where files will be saved.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :param concurrency: Maximum number of instances being saved at once.
+    :param naming: ``"index"`` for ``instance_<n>.json`` or ``"hash"`` for content-addressed file names.
+    :param format: Name of the serialization format (see :mod:`~expergen.format_utils`).
+    """
+    if naming not in NAMING_SCHEMES:
+        raise ValueError(f"Unknown naming '{naming}', expected one of {NAMING_SCHEMES}")
+    serialization_format = get_format(format)
+    await asyncio.to_thread(os.makedirs, destination_dir, exist_ok=True)
+
+    def save(position: int, instance: Any) -> bool:
+        if isinstance(instances, collections.abc.Sequence):
+            instance = instances[position]
+        return _save_instance(instance, position + 1, destination_dir, exclude_defaults, naming, None, serialization_format)[1]
+
+    if isinstance(instances, collections.abc.Sequence):
+        jobs = ((position, None) for position in range(len(instances)))
+    else:
+        jobs = _aenumerate(instances)
+    results = await _run_bounded(save, jobs, concurrency)
+    total, written = len(results), sum(results)
+    skipped = total - written
+    print(f"Saved {written} files to '{destination_dir}'." + (f" Skipped {skipped} existing." if skipped else ""))
+
+
+async def async_iter_from_directory(directory: str, model_type: Type[T], pattern: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: str = "contiguous") -> AsyncIterator[T]:
+    """
+    Asynchronous :func:`~expergen.json_utils.iter_from_directory`: files are read and validated in threads,
+    at most ``concurrency`` ahead of the consumer, and yielded in the same deterministic order.
+
+    :param directory: Path to the directory containing JSON files.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :param pattern: Glob pattern the file names have to match.
+    :param concurrency: Maximum number of files being loaded ahead of the consumer.
+    :param shard_index: Load only this shard of the ordered files (see :func:`~expergen.shard_utils.shard_range`).
+    :param num_shards: Number of shards.
+    :param shard_strategy: ``"contiguous"`` or ``"strided"``.
+    :return: Async iterator of instances of the specified type.
+    """
+    filenames = await asyncio.to_thread(list_instance_files, directory, pattern)
+    if shard_index is not None or num_shards is not None:
+        positions = shard_range(len(filenames), shard_index, num_shards, shard_strategy)
+        filenames = filenames[positions.start:positions.stop:positions.step]
+    filepaths = (os.path.join(directory, filename) for filename in filenames)
+    async for instance in _ordered(lambda filepath: asyncio.to_thread(load_from_json, filepath, model_type), _aiter(filepaths), concurrency):
+        yield instance
+
+
+async def async_load_from_directory(directory: str, model_type: Type[T], pattern: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: str = "contiguous") -> List[T]:
+    """
+    Asynchronous :func:`~expergen.json_utils.load_from_directory`, see :func:`async_iter_from_directory`.
+
+    :return: List of instances of the specified type.
+    """
+    return [instance async for instance in async_iter_from_directory(directory, model_type, pattern, concurrency, shard_index, num_shards, shard_strategy)]
+
+
+async def async_save_to_stream(instances: Union[Iterable[T], AsyncIterable[T]], stream: Any, exclude_defaults = True, concurrency: int = DEFAULT_CONCURRENCY) -> int:
+    """
+    Write instances as JSON Lines (one compact JSON document per line, in order) to an async byte stream.
+
+    ``stream`` needs a ``write(data)`` method, which may be a coroutine function (e.g. an object store upload)
+    or a plain method buffering the data (e.g. :class:`asyncio.StreamWriter`); an async ``drain()`` method,
+    if present, is awaited after every write so a slow consumer throttles serialization.
+
+    :param instances: Iterable or async iterable of instances (Pydantic models or dataclasses).
+    :param stream: Writable byte stream.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :param concurrency: Maximum number of instances being serialized ahead of the writes.
+    :return: Number of written instances.
+    """
+    count = 0
+
+    def serialize(job) -> bytes:
+        position, instance = job
+        return _dump_instance(instance, position + 1, exclude_defaults).encode() + b"\n"
+
+    drain = getattr(stream, 'drain', None)
+    jobs = _aenumerate(instances)
+    async for line in _ordered(lambda job: asyncio.to_thread(serialize, job), jobs, concurrency):
+        result = stream.write(line)
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
+        count += 1
+    return count
+
+
+async def async_iter_from_stream(stream: Any, model_type: Type[T], concurrency: int = DEFAULT_CONCURRENCY) -> AsyncIterator[T]:
+    """
+    Read instances written by :func:`async_save_to_stream` (or any JSON Lines) from an async byte stream:
+    an object with a ``readline()`` coroutine (e.g. :class:`asyncio.StreamReader`) or an async iterable of
+    byte chunks (e.g. an object store download). Lines are validated in threads, at most ``concurrency`` ahead.
+
+    :param stream: Readable byte stream.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :param concurrency: Maximum number of lines being validated ahead of the consumer.
+    :return: Async iterator of instances of the specified type.
+    """
+    async for instance in _ordered(lambda line: asyncio.to_thread(_validate_json, line, model_type), _aiter_lines(stream), concurrency):
+        yield instance
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def _aenumerate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    position = 0
+    if isinstance(items, collections.abc.AsyncIterable):
+        async for item in items:
+            yield position, item
+            position += 1
+    else:
+        for item in items:
+            yield position, item
+            position += 1
+
+
+async def _aiter_lines(stream: Any) -> AsyncIterator[bytes]:
+    """
+    Split a byte stream into non-empty lines.
+    """
+    if hasattr(stream, 'readline'):
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            if line.strip():
+                yield line
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def _run_bounded(function: Callable[..., Any], jobs: Union[Iterable[Any], AsyncIterable[Any]], concurrency: int) -> List[Any]:
+    """
+    Run ``function(*job)`` in threads for every job, with at most ``concurrency`` running at once.
+    Jobs are taken only when a slot is free; the first failure stops taking jobs and is raised.
+
+    :return: Results in the order of completion.
+    """
+    results = []
+    pending: Set[asyncio.Task] = set()
+    try:
+        async for job in _aiter(jobs) if not isinstance(jobs, collections.abc.AsyncIterable) else jobs:
+            if len(pending) >= max(1, concurrency):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                results.extend(task.result() for task in done)
+            pending.add(asyncio.ensure_future(asyncio.to_thread(function, *job)))
+        if pending:
+            done, pending = await asyncio.wait(pending)
+            results.extend(task.result() for task in done)
+    finally:
+        for task in pending:
+            task.cancel()
+    return results
+
+
+async def _ordered(start: Callable[[Any], Awaitable[Any]], jobs: AsyncIterable[Any], concurrency: int) -> AsyncIterator[Any]:
+    """
+    Start ``start(job)`` for the jobs with at most ``concurrency`` in flight and yield the results in job order.
+    """
+    pending = deque()
+    try:
+        async for job in jobs:
+            if len(pending) >= max(1, concurrency):
+                yield await pending.popleft()
+            pending.append(asyncio.ensure_future(start(job)))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -12,4 +12,12 @@ class ExpergenModelConfig(pydantic.BaseModel):
     @abc.abstractmethod 
     def create_model(self) -> ExpergenModel:
         pass
+
+    def get_model(self, cache=None) -> ExpergenModel:
+        """
+        Create the model, or reuse one built for an equal config if a :class:`~expergen.cache_utils.ModelCache` is given.
+        """
+        if cache is None:
+            return self.create_model()
+        return cache.get(self)
     
\ No newline at end of file
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+from .hash_utils import config_hash
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+    weight: int
+
+
+class ModelCache:
+    """
+    LRU cache of models built by :meth:`~expergen.base_classes.ExpergenModelConfig.create_model`, keyed by the
+    type and canonical content of the model config (see :func:`~expergen.hash_utils.config_hash`), so equal
+    configs reuse an already constructed model instead of building a new one.
+
+    Without ``clone`` the cached model itself is returned and shared by all equal configs. Pass e.g.
+    ``clone=copy.deepcopy`` (or a cheaper framework-specific copy) if the models are trained or otherwise mutated:
+    every hit then returns a clone, and so does the miss that built the model, so the cached instance stays pristine.
+
+    >>> cache = ModelCache(maxsize=4, clone=copy.deepcopy)
+    >>> models = [config.model.get_model(cache) for config in configs]
+    >>> cache.info()
+    CacheInfo(hits=..., misses=..., evictions=0, maxsize=4, currsize=..., weight=...)
+
+    :param maxsize: Maximum number of cached models; None for no limit.
+    :param clone: Called with the cached model before returning it; its result is returned instead of the cached model.
+    :param weigher: Size of a model (e.g. its number of parameters or bytes); defaults to 1 per model.
+    :param max_weight: Maximum total size of the cached models; None for no limit.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, clone: Callable[[Any], Any] = None, weigher: Callable[[Any], int] = None, max_weight: Optional[int] = None):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}")
+        self.maxsize = maxsize
+        self.clone = clone
+        self.weigher = weigher
+        self.max_weight = max_weight
+        self.hits = self.misses = self.evictions = 0
+        self._models: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.RLock()
+
+    def key(self, config: Any) -> Hashable:
+        """
+        Cache key of a config: its type and content hash.
+        """
+        return type(config).__module__, type(config).__qualname__, config_hash(config, cache=False)
+
+    def get(self, config: Any, factory: Callable[[Any], Any] = None) -> Any:
+        """
+        Return the model of ``config``, building it with ``factory(config)`` (``config.create_model()`` by default) on a miss.
+        """
+        key = self.key(config)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return self.clone(entry[0]) if self.clone is not None else entry[0]
+
+        model = factory(config) if factory is not None else config.create_model()
+        weight = self.weigher(model) if self.weigher is not None else 1
+        with self._lock:
+            self.misses += 1
+            if key in self._models:  # built concurrently by another thread
+                self._weight -= self._models.pop(key)[1]
+            self._models[key] = (model, weight)
+            self._weight += weight
+            self._evict()
+        return self.clone(model) if self.clone is not None else model
+
+    def __contains__(self, config: Any) -> bool:
+        return self.key(config) in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def info(self) -> CacheInfo:
+        """
+        Hit, miss and eviction counts and the current size, like :func:`functools.lru_cache`'s ``cache_info()``.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._models), self._weight)
+
+    def clear(self) -> None:
+        """
+        Drop all cached models and reset the statistics.
+        """
+        with self._lock:
+            self._models.clear()
+            self._weight = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _evict(self) -> None:
+        while self._models and ((self.maxsize is not None and len(self._models) > self.maxsize)
+                                or (self.max_weight is not None and self._weight > self.max_weight)):
+            _, (_, weight) = self._models.popitem(last=False)
+            self._weight -= weight
+            self.evictions += 1
@@ -0,0 +1,150 @@
+"""
+Command line sweep expander::
+
+    expergen sweep.yaml -o experiment_configs/sweep
+    expergen sweep.json --model mypackage.configs:ExperimentConfig --store -o sweep_store --num-shards 16 --shard-index 3
+
+The spec (JSON, or YAML if PyYAML is installed) describes the sweep::
+
+    model: mypackage.configs:ExperimentConfig      # import path of the config class (or --model)
+    base: {training: {optimizer: Adam}}            # optional overrides of the defaults of the base config
+    variations:
+      model.activation: [relu, tanh]
+      training.learning_rate: {uniform: [1.0e-5, 1.0e-1], log: true}   # continuous axes need sampling
+    transformations:
+      training.num_epochs: mypackage.sweeps:scale_epochs              # import paths of callables
+    sample: {n: 500, method: lhs, seed: 0}         # optional, see sample_variations
+    shard: {num_shards: 16, strategy: strided}     # optional; the command line arguments take precedence
+
+Only the standard library is imported until the arguments are parsed, so ``expergen --help`` is instant.
+"""
+import argparse
+import importlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+SPEC_KEYS = ("model", "base", "variations", "transformations", "sample", "shard")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="expergen", description="Expand a sweep spec into experiment configs.")
+    parser.add_argument("spec", help="JSON or YAML sweep spec")
+    parser.add_argument("-o", "--output", help="output directory (or store directory with --store)")
+    parser.add_argument("--model", help="import path of the config class, e.g. package.module:Class (overrides the spec)")
+    parser.add_argument("--store", action="store_true", help="write a JSONL store instead of one file per config")
+    parser.add_argument("--naming", choices=["index", "hash"], help="file names of the directory output (default: index)")
+    parser.add_argument("--format", help="serialization format of the directory output: json (default), compact, gzip, zstd, msgpack or a registered one")
+    parser.add_argument("--workers", type=int, help="worker processes writing the directory output")
+    parser.add_argument("--include-defaults", action="store_true", help="write fields equal to their defaults as well")
+    parser.add_argument("--shard-index", type=int, help="zero-based shard of the sweep to write")
+    parser.add_argument("--num-shards", type=int, help="number of shards (read from the environment if only one is given)")
+    parser.add_argument("--shard-strategy", choices=["contiguous", "strided"], help="how the sweep is split into shards")
+    parser.add_argument("--count", action="store_true", help="only print the number of configs")
+    args = parser.parse_args(argv)
+    if args.store and (args.naming or args.format or args.workers is not None):
+        parser.error("argument --store: not allowed with --naming, --format or --workers")
+
+    try:
+        spec = load_spec(args.spec)
+        configs = expand(spec, args.model, args.shard_index, args.num_shards, args.shard_strategy)
+    except (OSError, ValueError, TypeError, ImportError, AttributeError) as error:
+        parser.exit(2, f"expergen: error: {error}\n")
+    if args.count:
+        print(len(configs))
+        return 0
+    if not args.output:
+        parser.error("the following arguments are required: -o/--output")
+    if args.format:
+        # Checked after expanding the spec, whose imports may register further formats.
+        from .format_utils import FORMATS
+        if args.format not in FORMATS:
+            parser.error(f"argument --format: invalid choice: '{args.format}' (choose from {', '.join(map(repr, FORMATS))})")
+    if args.store:
+        from .store_utils import save_to_store
+        save_to_store(configs, args.output, exclude_defaults=not args.include_defaults)
+    else:
+        from .json_utils import save_to_directory
+        save_to_directory(configs, args.output, exclude_defaults=not args.include_defaults, workers=args.workers, naming=args.naming or "index", format=args.format or "json")
+    return 0
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """
+    Read a sweep spec from a JSON or YAML file (by extension; YAML requires PyYAML).
+    """
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML specs require PyYAML (pip install pyyaml)") from None
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if not isinstance(spec, dict):
+        raise ValueError(f"The spec in '{path}' must be a mapping")
+    unknown = set(spec) - set(SPEC_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown spec keys {sorted(unknown)}, expected some of {SPEC_KEYS}")
+    return spec
+
+
+def expand(spec: Dict[str, Any], model: Optional[str] = None, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: Optional[str] = None):
+    """
+    Turn a parsed spec into the (lazy, if not sampled) sequence of configs of the selected shard.
+
+    :param spec: Parsed sweep spec, see the module documentation.
+    :param model: Import path of the config class overriding ``spec["model"]``.
+    :param shard_index: Shard to select, overriding the spec.
+    :param num_shards: Number of shards, overriding the spec.
+    :param shard_strategy: ``"contiguous"`` or ``"strided"``, overriding the spec.
+    :return: Sequence of config instances.
+    """
+    from .json_utils import _validate_json_data
+    from .sampling_utils import Uniform, sample_variations
+    from .dataclass_utils import generate_variations
+    from .shard_utils import shard_range
+
+    model = model or spec.get("model")
+    if not model:
+        raise ValueError("No config class given, set 'model' in the spec or pass --model")
+    model_type = import_object(model)
+    base = _validate_json_data(spec.get("base") or {}, model_type)
+    variations = {}
+    for key, values in (spec.get("variations") or {}).items():
+        if isinstance(values, dict):
+            if set(values) - {"uniform", "log"} or "uniform" not in values:
+                raise ValueError(f"Unsupported distribution {values} for '{key}', expected {{uniform: [low, high], log: false}}")
+            values = Uniform(*values["uniform"], log=values.get("log", False))
+        variations[key] = values
+    transformations = {key: import_object(path) for key, path in (spec.get("transformations") or {}).items()} or None
+
+    shard = dict(spec.get("shard") or {})
+    shard_index = shard_index if shard_index is not None else shard.get("shard_index")
+    num_shards = num_shards if num_shards is not None else shard.get("num_shards")
+    shard_strategy = shard_strategy or shard.get("strategy", "contiguous")
+
+    sample = spec.get("sample")
+    if sample is None:
+        return generate_variations(base, variations, transformations, shard_index=shard_index, num_shards=num_shards, shard_strategy=shard_strategy)
+    configs = sample_variations(base, variations, transformations=transformations, **sample)
+    if shard_index is not None or num_shards is not None:
+        positions = shard_range(len(configs), shard_index, num_shards, shard_strategy)
+        configs = configs[positions.start:positions.stop:positions.step]
+    return configs
+
+
+def import_object(path: str) -> Any:
+    """
+    Import an object from ``package.module:name`` (or ``package.module.name``).
+    """
+    module_name, separator, attribute = path.partition(':')
+    if not separator:
+        module_name, _, attribute = path.rpartition('.')
+    if not module_name or not attribute:
+        raise ImportError(f"Invalid import path '{path}', expected 'package.module:name'")
+    obj = importlib.import_module(module_name)
+    for part in attribute.split('.'):
+        obj = getattr(obj, part)
+    return obj
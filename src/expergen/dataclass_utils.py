@@ -1,98 +1,546 @@
 from dataclasses import asdict, fields, make_dataclass, is_dataclass
-from itertools import product
-from typing import List, Dict, Any, Iterable, Type, Callable, Union, get_type_hints
+from collections.abc import Sequence
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, Type, Callable, Union, get_type_hints
 from pydantic import BaseModel
 import copy
+import functools
+import itertools
+import math
 
-def generate_variations(instance: Any, variations: Dict[str, Union[Iterable, Dict[str, Iterable]]], transformations: Dict[str, Union[Callable, Dict[str, Callable]]] = None) -> List[Any]:
+import numpy as np
+
+from .profile_utils import Profiler, TRANSFORM_PREFIX
+
+def generate_variations(instance: Any, variations: Dict[str, Union[Iterable, Dict[str, Iterable]]], transformations: Dict[str, Union[Callable, Dict[str, Callable]]] = None, deep_copy: bool = False, constraints: Dict[Union[str, Tuple[str, ...]], Callable[..., bool]] = None, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: str = "contiguous", shard_cost: Callable[[Dict[str, Any]], float] = None, batch_transformations: Dict[str, Union[Callable, Tuple[Callable, Sequence]]] = None, profiler: Optional[Profiler] = None) -> "VariationSpace":
     """
     Generate all variations of the dataclass based on the given parameter iterables and apply custom transformations.
     Supports nested dataclasses with dot notation.
+
+    The variations are not materialized: the returned :class:`VariationSpace` builds each instance on access,
+    so huge grids can be streamed, sliced and indexed in constant memory.
+
+    By default instances are built copy-on-write: only the objects along the modified paths are copied and
+    all untouched subtrees (e.g. large default lists) are shared with the base instance and between variants.
+    Pass ``deep_copy=True`` if the generated instances are going to be mutated in place and must be fully independent.
+
+    Constraints prune invalid combinations before any instance is built. Each constraint is a predicate attached to
+    one varied key or a tuple of them and is called with their values (in the order of the tuple), e.g.
+    ``{("training.optimizer", "training.scheduler"): lambda opt, sched: opt != "SGD" or sched == "step"}``.
+
+    Batch transformations compute a field for all combinations at once instead of once per instance. Each one is
+    a vectorized function receiving NumPy columns and returning the column of new values, optionally paired with
+    the varied keys whose columns are passed as further arguments, e.g.
+    ``{"training.learning_rate": (lambda lr, bs: lr * np.sqrt(bs / 32), ["training.batch_size"])}``.
+    They are applied after the variations and before the per-instance ``transformations``.
     
     :param instance: Instance of the dataclass.
     :param variations: Dictionary where keys are field names (with dot notation for nested fields) and values are iterables of possible values.
     :param transformations: Dictionary where keys are field names (with dot notation for nested fields) and values are callable transformations.
-    :return: List of dataclass instances with all combinations of variations and transformations applied.
+    :param deep_copy: Deep-copy the base instance for every combination instead of sharing untouched subtrees.
+    :param constraints: Dictionary where keys are varied field names (or tuples of them) and values are predicates the combination has to satisfy.
+    :param shard_index: Return only this shard of the variations (see :meth:`VariationSpace.shard`).
+    :param num_shards: Number of shards; with only one of ``shard_index``/``num_shards`` given the other is read from the environment.
+    :param shard_strategy: ``"contiguous"``, ``"strided"`` or ``"balanced"``.
+    :param shard_cost: Cost function of a combination used by the ``"balanced"`` strategy.
+    :param batch_transformations: Dictionary where keys are field names (with dot notation for nested fields) and values are
+        vectorized transformations, or tuples of a transformation and the varied keys it additionally depends on.
+    :param profiler: :class:`~expergen.profile_utils.Profiler` recording the time spent in the stages of building every instance.
+    :return: Lazy sequence of dataclass instances with all combinations of variations and transformations applied.
     """
-    def get_nested_field(obj, field_path):
-        for part in field_path.split('.'):
+    space = VariationSpace(instance, variations, transformations, deep_copy=deep_copy, constraints=constraints, batch_transformations=batch_transformations, profiler=profiler)
+    if space.continuous:
+        raise TypeError("Continuous distributions cannot be enumerated; draw instances with sample_variations instead")
+    if shard_index is not None or num_shards is not None:
+        space = space.shard(shard_index, num_shards, shard_strategy, shard_cost)
+    return space
+
+
+class VariationSpace(Sequence):
+    """
+    Lazy, indexable cartesian product of variations applied to a base instance.
+
+    The length is known without enumerating the combinations, iteration yields freshly built instances and
+    ``space[i]`` decodes ``i`` into per-axis choices (mixed radix, last key varying fastest - the same order
+    as :func:`itertools.product`). Slicing returns another lazy ``VariationSpace``.
+
+    Unless ``deep_copy`` is set, built instances share every subtree that is not on a modified path
+    with the base instance, so mutating such a subtree in place affects all variants.
+
+    An axis may also be a continuous distribution (any object with a ``ppf`` method, see
+    :class:`~expergen.sampling_utils.Uniform`). Such a space cannot be enumerated, only sampled.
+
+    With constraints the space contains only the combinations satisfying all predicates. They are found by a
+    depth-first expansion over the axes which evaluates every predicate as soon as all its keys are assigned,
+    cutting whole branches. Subtree sizes are memoized on the values the remaining constraints depend on,
+    which gives the exact length and random access without building or listing the surviving combinations.
+
+    Batch transformations are evaluated once, when the space is created, over the distinct combinations of the keys
+    they read (not over the whole product), and their results are validated there, so building an instance only
+    looks up the precomputed value.
+    """
+
+    def __init__(self, instance: Any, variations: Dict[str, Iterable], transformations: Dict[str, Callable] = None, deep_copy: bool = False, constraints: Dict[Union[str, Tuple[str, ...]], Callable[..., bool]] = None, batch_transformations: Dict[str, Union[Callable, Tuple[Callable, Sequence]]] = None, profiler: Optional[Profiler] = None):
+        self.instance = instance
+        self.deep_copy = deep_copy
+        self.keys = tuple(variations.keys()) if variations else ()
+        self.axes = tuple(values if is_distribution(values) else tuple(values) for values in variations.values()) if variations else ()
+        self.transformations = transformations or {}
+        self.continuous = any(is_distribution(axis) for axis in self.axes)
+        self._indices = None if self.continuous else range(math.prod(len(axis) for axis in self.axes))
+        self.constraints = constraints or {}
+        self.batch_transformations = batch_transformations or {}
+        self.profiler = profiler
+
+        self._fields = tuple(compile_field_path(key) for key in self.keys)
+        self._transforms = tuple((compile_field_path(key), transform) for key, transform in self.transformations.items())
+
+        # Keys nested under another varied key depend on the value chosen for their parent,
+        # so they can only be checked once the combination is known. All other candidate
+        # values are validated here, once per axis instead of once per combination.
+        self._dependent = frozenset(
+            key for key in self.keys
+            if any(key.startswith(other + '.') for other in self.keys if other != key)
+        )
+        for field, axis in zip(self._fields, self.axes):
+            if field.path not in self._dependent:
+                expected_type = field.expected_type(instance)
+                is_valid = type_validator(expected_type)
+                for value in ([distribution_value(axis, 0.5)] if is_distribution(axis) else axis):
+                    if not is_valid(value):
+                        raise TypeError(f"Expected type {expected_type} for field '{field.path}', but got {type(value).__name__}")
+
+        if self.constraints:
+            self._compile_constraints()
+        self._batch = self._compile_batch_transformations() if self.batch_transformations else ()
+
+    def __len__(self) -> int:
+        return len(self._index_range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = copy.copy(self)
+            view._indices = self._index_range[index]
+            return view
+        positions = self._positions(self._index_range[index])
+        return self._build(self._values(positions), positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        for positions in self.positions():
+            yield self._build(self._values(positions), positions)
+
+    def combinations(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over the chosen values (one per key, in the order of ``keys``) without building instances.
+        """
+        for positions in self.positions():
+            yield self._values(positions)
+
+    def positions(self) -> Iterator[Tuple[int, ...]]:
+        """
+        Iterate over the positions of the chosen values within their axes, one tuple per combination.
+        """
+        indices = self._index_range
+        if self.constraints and indices.step == 1:
+            yield from itertools.islice(self._walk(0, [], indices.start), len(indices))
+            return
+        for index in indices:
+            yield self._positions(index)
+
+    def shard(self, shard_index: Optional[int] = None, num_shards: Optional[int] = None, strategy: str = "contiguous", cost: Callable[[Dict[str, Any]], float] = None) -> "VariationSpace":
+        """
+        Deterministically select one shard of the space, e.g. for a task of a cluster array job.
+        No instance outside the shard is built.
+
+        :param shard_index: Zero-based index of the shard; read from the environment if None (see :func:`~expergen.shard_utils.shard_from_env`).
+        :param num_shards: Number of shards; read from the environment if None.
+        :param strategy: ``"contiguous"`` blocks, ``"strided"`` (every ``num_shards``-th combination) or ``"balanced"``
+            contiguous blocks of equal total ``cost``.
+        :param cost: Estimated cost of a combination, called with a dictionary of the varied keys and their values
+            for every combination (required by the ``"balanced"`` strategy).
+        :return: Lazy VariationSpace of the shard.
+        """
+        from .shard_utils import shard_range, balanced_shard_range
+        if strategy == "balanced":
+            if cost is None:
+                raise ValueError("The balanced shard strategy requires a cost function")
+            costs = (cost(dict(zip(self.keys, combination))) for combination in self.combinations())
+            positions = balanced_shard_range(costs, shard_index, num_shards)
+        else:
+            positions = shard_range(len(self), shard_index, num_shards, strategy)
+        view = copy.copy(self)
+        view._indices = self._index_range[positions.start:positions.stop:positions.step]
+        return view
+
+    def unique(self) -> Iterator[Any]:
+        """
+        Iterate over the space skipping instances identical to an earlier one, e.g. when a transformation
+        collapses distinct combinations into the same config (see :func:`~expergen.hash_utils.iter_unique`).
+        """
+        from .hash_utils import iter_unique
+        return iter_unique(self)
+
+    @property
+    def _index_range(self) -> range:
+        if self._indices is None:
+            raise TypeError(f"{type(self).__name__} with continuous axes cannot be enumerated, only sampled")
+        return self._indices
+
+    def __repr__(self) -> str:
+        size = "continuous" if self.continuous else len(self)
+        return f"{type(self).__name__}(len={size}, keys={list(self.keys)})"
+
+    def _values(self, positions: Tuple[int, ...]) -> Tuple[Any, ...]:
+        """
+        Look up the chosen value of every axis from the value positions.
+        """
+        return tuple(axis[position] for axis, position in zip(self.axes, positions))
+
+    def _positions(self, index: int) -> Tuple[int, ...]:
+        if self.constraints:
+            return self._constrained_positions(index)
+        positions = []
+        for axis in reversed(self.axes):
+            index, position = divmod(index, len(axis))
+            positions.append(position)
+        return tuple(reversed(positions))
+
+    def _compile_constraints(self) -> None:
+        if self.continuous:
+            raise ValueError("Constraints are not supported for continuous distributions")
+        positions = {key: position for position, key in enumerate(self.keys)}
+        # Predicates grouped by the depth at which all their keys are assigned.
+        self._checks = [[] for _ in self.axes]
+        for keys, predicate in self.constraints.items():
+            keys = (keys,) if isinstance(keys, str) else tuple(keys)
+            unknown = [key for key in keys if key not in positions]
+            if unknown or not keys:
+                raise ValueError(f"Constraint on {unknown or keys} which is not a varied field")
+            key_positions = tuple(positions[key] for key in keys)
+            self._checks[max(key_positions)].append((key_positions, predicate))
+        # Assigned axes that still matter for checks at this depth or deeper; they form the memo key.
+        self._relevant = [
+            tuple(sorted({p for later in self._checks[depth:] for key_positions, _ in later for p in key_positions if p < depth}))
+            for depth in range(len(self.axes) + 1)
+        ]
+        self._counts = {}
+        self._indices = range(self._count(0, []))
+
+    def _passes(self, depth: int, choices: List[int]) -> bool:
+        for key_positions, predicate in self._checks[depth]:
+            if not predicate(*(self.axes[p][choices[p]] for p in key_positions)):
+                return False
+        return True
+
+    def _count(self, depth: int, choices: List[int]) -> int:
+        """
+        Number of valid completions of the partial assignment ``choices`` (value positions of the first ``depth`` axes).
+        """
+        if depth == len(self.axes):
+            return 1
+        key = (depth, tuple(choices[p] for p in self._relevant[depth]))
+        count = self._counts.get(key)
+        if count is None:
+            count = 0
+            for choice in range(len(self.axes[depth])):
+                choices.append(choice)
+                if self._passes(depth, choices):
+                    count += self._count(depth + 1, choices)
+                choices.pop()
+            self._counts[key] = count
+        return count
+
+    def _constrained_positions(self, index: int) -> Tuple[int, ...]:
+        choices = []
+        for depth, axis in enumerate(self.axes):
+            for choice in range(len(axis)):
+                choices.append(choice)
+                if self._passes(depth, choices):
+                    count = self._count(depth + 1, choices)
+                    if index < count:
+                        break
+                    index -= count
+                choices.pop()
+        return tuple(choices)
+
+    def _walk(self, depth: int, choices: List[int], skip: int) -> Iterator[Tuple[int, ...]]:
+        """
+        Depth-first expansion yielding the value positions of valid combinations in index order, starting after ``skip`` of them.
+        """
+        if depth == len(self.axes):
+            yield tuple(choices)
+            return
+        for choice in range(len(self.axes[depth])):
+            choices.append(choice)
+            if self._passes(depth, choices):
+                count = self._count(depth + 1, choices)
+                if skip >= count:
+                    skip -= count
+                else:
+                    yield from self._walk(depth + 1, choices, skip)
+                    skip = 0
+            choices.pop()
+
+    def _compile_batch_transformations(self) -> Tuple[Tuple["FieldPath", Tuple[int, ...], Tuple[int, ...], List[Any], bool], ...]:
+        """
+        Evaluate every batch transformation over the grid of the axes it reads.
+
+        :return: Tuples of the field, the positions of the axes read, their strides within the grid,
+            the transformed value of every grid point and whether the values still need a per-instance type check.
+        """
+        from .frame_utils import _value_table
+        if self.continuous:
+            raise ValueError("Batch transformations are not supported for continuous distributions")
+        axis_positions = {key: position for position, key in enumerate(self.keys)}
+        compiled = []
+        for key, transform in self.batch_transformations.items():
+            transform, dependencies = transform if isinstance(transform, tuple) else (transform, ())
+            dependencies = (dependencies,) if isinstance(dependencies, str) else tuple(dependencies)
+            unknown = [name for name in dependencies if name not in axis_positions]
+            if unknown:
+                raise ValueError(f"Batch transformation of '{key}' depends on {unknown} which are not varied fields")
+            field = compile_field_path(key)
+            inputs = tuple(axis_positions[name] for name in dict.fromkeys([key, *dependencies]) if name in axis_positions)
+            radices = [len(self.axes[position]) for position in inputs]
+            size = math.prod(radices)  # 1 if no varied field is read: a single grid point
+            grid = np.indices(radices, dtype=np.int64).reshape(len(inputs), size)
+
+            def column(name: str) -> np.ndarray:
+                if name in axis_positions:
+                    return _value_table(self.axes[axis_positions[name]])[grid[inputs.index(axis_positions[name])]]
+                return _value_table((field.get(self.instance),))[np.zeros(size, dtype=np.int64)]
+
+            result = transform(column(key), *(column(name) for name in dependencies))
+            values = result.tolist() if isinstance(result, np.ndarray) else list(result)
+            if len(values) != size:
+                raise ValueError(f"Batch transformation of '{key}' returned {len(values)} values for {size} combinations")
+            # Fields nested under a varied key can change type with the combination and are checked per instance.
+            nested = any(key.startswith(other + '.') for other in self.keys if other != key)
+            if not nested:
+                expected_type = field.expected_type(self.instance)
+                is_valid = type_validator(expected_type)
+                for value in values:
+                    if not is_valid(value):
+                        raise TypeError(f"Expected type {expected_type} for field '{key}', but got {type(value).__name__}")
+            strides = tuple(math.prod(radices[i + 1:]) for i in range(len(radices)))
+            compiled.append((field, inputs, strides, values, nested))
+        return tuple(compiled)
+
+    def _build(self, combination: Tuple[Any, ...], positions: Tuple[int, ...] = None) -> Any:
+        if self.profiler is not None:
+            return self._build_profiled(combination, positions)
+        new_instance, owned = self._copy_base()
+        self._assign(new_instance, owned, combination)
+        if self._batch:
+            self._assign_batch(new_instance, owned, positions)
+        # Apply transformations if provided
+        for field, transform in self._transforms:
+            self._set_checked(new_instance, owned, field, transform(field.get(new_instance)))
+        return new_instance
+
+    def _build_profiled(self, combination: Tuple[Any, ...], positions: Tuple[int, ...] = None) -> Any:
+        """
+        Same steps as :meth:`_build`, each timed with ``self.profiler``.
+        """
+        profiler = self.profiler
+        with profiler.stage("build"):
+            with profiler.stage("copy"):
+                new_instance, owned = self._copy_base()
+            with profiler.stage("assign"):
+                self._assign(new_instance, owned, combination)
+            if self._batch:
+                with profiler.stage("batch_transformations"):
+                    self._assign_batch(new_instance, owned, positions)
+            for field, transform in self._transforms:
+                with profiler.stage(TRANSFORM_PREFIX + field.path):
+                    new_value = transform(field.get(new_instance))
+                with profiler.stage("type_check"):
+                    self._set_checked(new_instance, owned, field, new_value)
+        profiler.count("built")
+        return new_instance
+
+    def _copy_base(self) -> Tuple[Any, Optional[Set[int]]]:
+        """
+        Copy the base instance.
+
+        :return: The copy and the ids of the objects it owns (None if deep copied, i.e. it owns everything).
+        """
+        if self.deep_copy:
+            return copy.deepcopy(self.instance), None
+        new_instance = copy.copy(self.instance)
+        return new_instance, {id(new_instance)}
+
+    def _assign(self, new_instance: Any, owned: Optional[Set[int]], combination: Tuple[Any, ...]) -> None:
+        for field, value in zip(self._fields, combination):
+            if field.path in self._dependent:
+                field.check(new_instance, value)
+            field.set(new_instance, value, owned)
+
+    def _assign_batch(self, new_instance: Any, owned: Optional[Set[int]], positions: Tuple[int, ...]) -> None:
+        for field, inputs, strides, values, nested in self._batch:
+            value = values[sum(positions[input] * stride for input, stride in zip(inputs, strides))]
+            if nested:
+                field.check(new_instance, value)
+            field.set(new_instance, copy.deepcopy(value) if self.deep_copy else value, owned)
+
+    @staticmethod
+    def _set_checked(new_instance: Any, owned: Optional[Set[int]], field: "FieldPath", value: Any) -> None:
+        field.check(new_instance, value)
+        field.set(new_instance, value, owned)
+
+
+def is_distribution(obj: Any) -> bool:
+    """
+    Check if a variation axis is a continuous distribution, i.e. has an inverse CDF ``ppf`` (like scipy.stats distributions).
+    """
+    return hasattr(obj, 'ppf')
+
+
+def distribution_value(distribution: Any, quantile: float) -> Any:
+    """
+    Map a quantile in [0, 1) to a value of the distribution, converting NumPy scalars to Python ones.
+    """
+    value = distribution.ppf(quantile)
+    return value.item() if hasattr(value, 'item') else value
+
+
+def get_nested_field(obj, field_path):
+    return compile_field_path(field_path).get(obj)
+
+
+def set_nested_field(obj, field_path, value):
+    compile_field_path(field_path).set(obj, value)
+
+
+def check_type(obj, field_path, value):
+    compile_field_path(field_path).check(obj, value)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_field_path(field_path: str) -> "FieldPath":
+    """
+    Compile a dotted field path once; the result is cached and shared by all callers.
+
+    :param field_path: Field name with dot notation for nested fields.
+    :return: FieldPath with pre-split accessor, setter and validator.
+    """
+    return FieldPath(field_path)
+
+
+class FieldPath:
+    """
+    Dotted field path resolved into its parts, so reading, writing and validating a field
+    does not re-parse the path or re-resolve type hints for every instance.
+    """
+    __slots__ = ('path', 'parts')
+
+    def __init__(self, field_path: str):
+        self.path = field_path
+        self.parts = tuple(field_path.split('.'))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+    def parent(self, obj, owned: Set[int] = None):
+        """
+        Return the object holding the last part of the path.
+
+        :param obj: Root object.
+        :param owned: Ids of objects private to ``obj``. If given, every other object along the path is
+            shallow-copied (and recorded as owned) before descending into it (copy-on-write).
+        """
+        for part in self.parts[:-1]:
             if isinstance(obj, dict):
-                obj = obj[part]
+                child = obj[part]
             else:
-                obj = getattr(obj, part)
+                child = getattr(obj, part)
+            if owned is not None and id(child) not in owned:
+                child = copy.copy(child)
+                owned.add(id(child))
+                if isinstance(obj, dict):
+                    obj[part] = child
+                else:
+                    setattr(obj, part, child)
+            obj = child
         return obj
 
-    def set_nested_field(obj, field_path, value):
-        parts = field_path.split('.')
-        for part in parts[:-1]:
-            if isinstance(obj, dict):
-                obj = obj[part]
-            else:
-                obj = getattr(obj, part)
+    def get(self, obj):
+        obj = self.parent(obj)
         if isinstance(obj, dict):
-            obj[parts[-1]] = value
+            return obj[self.parts[-1]]
+        return getattr(obj, self.parts[-1])
+
+    def set(self, obj, value, owned: Set[int] = None):
+        obj = self.parent(obj, owned)
+        if isinstance(obj, dict):
+            obj[self.parts[-1]] = value
         else:
-            setattr(obj, parts[-1], value)
+            setattr(obj, self.parts[-1], value)
 
-    def check_type(obj, field_path, value):
-        parts = field_path.split('.')
+    def expected_type(self, obj):
+        """
+        Resolve the declared type of the field by walking the (runtime) classes along the path.
+        """
         current_obj = obj
-        current_type_hints = get_type_hints(type(obj))
-        
-        for part in parts:
+        current_type_hints = _type_hints(type(obj))
+
+        for part in self.parts:
             if part not in current_type_hints:
                 raise ValueError(f"Field '{part}' not found in {type(current_obj).__name__}")
-            
-            
+
             expected_type = current_type_hints[part]
-            # TODO handle BaseModels from pydantic
-            if is_pydantic_base_model(current_obj):
-                current_obj = getattr(current_obj, part)
-                current_type_hints = get_type_hints(type(current_obj))
-            elif is_dataclass(current_obj):
+            if is_pydantic_base_model(current_obj) or is_dataclass(current_obj):
                 current_obj = getattr(current_obj, part)
-                current_type_hints = get_type_hints(type(current_obj))
+                current_type_hints = _type_hints(type(current_obj))
             else:
                 break
-        
-        def check_nested_type(value, expected_type):
-            if hasattr(expected_type, '__origin__'):  # For generic types like List, Dict, etc.
-                if expected_type.__origin__ is Union:
-                    return any(check_nested_type(value, t) for t in expected_type.__args__)
-                if expected_type.__origin__ is list:
-                    return isinstance(value, list) and all(check_nested_type(v, expected_type.__args__[0]) for v in value)
-                if expected_type.__origin__ is dict:
-                    return isinstance(value, dict) and all(check_nested_type(k, expected_type.__args__[0]) and check_nested_type(v, expected_type.__args__[1]) for k, v in value.items())
-            elif is_dataclass(expected_type) or (isinstance(expected_type, type) and issubclass(expected_type, BaseModel)):
-                return isinstance(value, expected_type)
-            else:
-                return isinstance(value, expected_type)
-    
-    
+        return expected_type
 
-        if not check_nested_type(value, expected_type):
-            raise TypeError(f"Expected type {expected_type} for field '{field_path}', but got {type(value).__name__}")
-    keys, iterables = zip(*variations.items()) if variations else ([], [])
-    combinations = list(product(*iterables)) if iterables else [()]
-
-    results = []
-    for combination in combinations:
-        new_instance = copy.deepcopy(instance)
-        for field, value in zip(keys, combination):
-            check_type(new_instance, field, value)
-            set_nested_field(new_instance, field, value)
-        
-        # Apply transformations if provided
-        if transformations:
-            for field, transform in transformations.items():
-                current_value = get_nested_field(new_instance, field)
-                new_value = transform(current_value)
-                check_type(new_instance, field, new_value)
-                set_nested_field(new_instance, field, new_value)
-        
-        results.append(new_instance)
-    
-    return results
+    def check(self, obj, value):
+        expected_type = self.expected_type(obj)
+        if not type_validator(expected_type)(value):
+            raise TypeError(f"Expected type {expected_type} for field '{self.path}', but got {type(value).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _type_hints(cls) -> Dict[str, Any]:
+    return get_type_hints(cls)
+
+
+def type_validator(expected_type) -> Callable[[Any], bool]:
+    """
+    Return a predicate checking values against ``expected_type``; predicates are built once per type.
+
+    :param expected_type: Type annotation (supports Union, List, Dict, dataclasses and BaseModels).
+    :return: Callable returning True if the value matches the type.
+    """
+    try:
+        return _cached_type_validator(expected_type)
+    except TypeError:  # unhashable annotation
+        return _make_type_validator(expected_type)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_type_validator(expected_type) -> Callable[[Any], bool]:
+    return _make_type_validator(expected_type)
+
+
+def _make_type_validator(expected_type) -> Callable[[Any], bool]:
+    if expected_type is Any:
+        return lambda value: True
+    origin = getattr(expected_type, '__origin__', None)
+    if origin is not None:  # For generic types like List, Dict, etc.
+        args = expected_type.__args__
+        if origin is Union:
+            options = tuple(type_validator(t) for t in args)
+            return lambda value: any(check(value) for check in options)
+        if origin is list:
+            check_item = type_validator(args[0])
+            return lambda value: isinstance(value, list) and all(check_item(v) for v in value)
+        if origin is dict:
+            check_key, check_value = type_validator(args[0]), type_validator(args[1])
+            return lambda value: isinstance(value, dict) and all(check_key(k) and check_value(v) for k, v in value.items())
+        return lambda value: False
+    return lambda value: isinstance(value, expected_type)
 
 # This function is no longer needed with the new implementation
 def is_pydantic_base_model(obj: Any) -> bool:
@@ -0,0 +1,168 @@
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from .dataclass_utils import VariationSpace, compile_field_path
+from .json_utils import is_pydantic_model, _validate_json_data
+from .store_utils import ConfigStore, StoreWriter
+
+T = TypeVar('T', bound=BaseModel)
+
+DELTA_BASE = "base.json"
+
+
+def save_deltas(instances: Iterable[T], destination_dir: str, base: Optional[T] = None, shard_size: int = 10000) -> int:
+    """
+    Save the base config once and every instance as a diff of changed dotted paths relative to it.
+    The diffs are kept in a store (see :func:`~expergen.store_utils.save_to_store`), one JSON object per instance
+    mapping dotted paths to their new values, e.g. ``{"training.num_epochs": 50}``.
+
+    For a :class:`~expergen.dataclass_utils.VariationSpace` the base defaults to the space's base instance and only
+    the varied and transformed paths are compared, without serializing the whole instance.
+
+    :param instances: Iterable of instances (Pydantic models or dataclasses), consumed once.
+    :param destination_dir: Path to the directory where the base and the diffs will be saved.
+    :param base: Instance the diffs are relative to.
+    :param shard_size: Number of diffs per shard file.
+    :return: Number of saved instances.
+    """
+    if base is None:
+        if not isinstance(instances, VariationSpace):
+            raise ValueError("base is required unless instances is a VariationSpace")
+        base = instances.instance
+    base_data = to_jsonable(base)
+
+    with StoreWriter(destination_dir, shard_size, metadata={"base": DELTA_BASE}) as writer:
+        with open(os.path.join(destination_dir, DELTA_BASE), 'w') as f:
+            json.dump(base_data, f, indent=4)
+        if isinstance(instances, VariationSpace) and base is instances.instance:
+            paths = [compile_field_path(path) for path in dict.fromkeys([*instances.keys, *instances.batch_transformations, *instances.transformations])]
+            for instance in instances:
+                writer.write(_dumps(_space_delta(instance, paths, base_data)))
+        else:
+            for instance in instances:
+                writer.write(_dumps(diff(base_data, to_jsonable(instance))))
+    print(f"Saved {writer.count} deltas to '{destination_dir}'.")
+    return writer.count
+
+
+def open_deltas(directory: str, model_type: Type[T]) -> "DeltaStore[T]":
+    """
+    Open diffs written by :func:`save_deltas`; instances are reconstructed on access.
+
+    :param directory: Directory written by :func:`save_deltas`.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :return: DeltaStore of the specified type.
+    """
+    return DeltaStore(directory, model_type)
+
+
+def load_deltas(directory: str, model_type: Type[T]) -> List[T]:
+    """
+    Load and reconstruct all instances written by :func:`save_deltas`.
+
+    :param directory: Directory written by :func:`save_deltas`.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :return: List of instances of the specified type.
+    """
+    with open_deltas(directory, model_type) as store:
+        return list(store)
+
+
+class DeltaStore(ConfigStore):
+    """
+    Store of diffs; ``store[i]`` applies the i-th diff to the base config and validates the result.
+    """
+
+    def __init__(self, store_dir: str, model_type: Type[T]):
+        super().__init__(store_dir, model_type)
+        if "base" not in self.metadata:
+            raise ValueError(f"'{store_dir}' does not contain deltas")
+        with open(os.path.join(store_dir, self.metadata["base"])) as f:
+            self.base_data = json.load(f)
+
+    def _validate(self, record: bytes) -> T:
+        return _validate_json_data(apply_delta(self.base_data, json.loads(record)), self.model_type)
+
+
+def to_jsonable(instance: Any) -> Any:
+    """
+    Convert a Pydantic model or dataclass to plain JSON-compatible Python data, including default values.
+    """
+    if is_pydantic_model(instance):
+        return instance.model_dump(mode='json')
+    return to_jsonable_python(instance)
+
+
+def diff(base: Any, other: Any, prefix: str = '') -> Dict[str, Any]:
+    """
+    Compute the dotted paths (and their values in ``other``) where ``other`` differs from ``base``.
+    Objects with the same keys are compared recursively, anything else is replaced as a whole.
+
+    :param base: JSON-compatible data of the base config.
+    :param other: JSON-compatible data of the compared config.
+    :return: Mapping from dotted paths to the values in ``other``; empty if equal.
+    """
+    if base == other:
+        return {}
+    if (isinstance(base, dict) and isinstance(other, dict) and base.keys() == other.keys()
+            and not any('.' in key for key in base)):
+        changes = {}
+        for key, value in other.items():
+            changes.update(diff(base[key], value, f"{prefix}{key}."))
+        return changes
+    return {prefix[:-1]: other}
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a diff produced by :func:`diff` to ``base`` without modifying it.
+    Only the dictionaries along the changed paths are copied.
+
+    :param base: JSON-compatible data of the base config.
+    :param delta: Mapping from dotted paths to new values, applied in order.
+    :return: New JSON-compatible data.
+    """
+    if '' in delta:
+        return delta['']
+    result = dict(base)
+    owned = {id(result)}
+    for path, value in delta.items():
+        parts = path.split('.')
+        obj = result
+        for part in parts[:-1]:
+            child = obj[part]
+            if id(child) not in owned:
+                child = dict(child)
+                owned.add(id(child))
+                obj[part] = child
+            obj = child
+        obj[parts[-1]] = value
+    return result
+
+
+def _space_delta(instance: Any, paths, base_data: Dict[str, Any]) -> Dict[str, Any]:
+    delta = {}
+    for path in paths:
+        value = to_jsonable_python(path.get(instance))
+        if _lookup(base_data, path.parts) != value:
+            delta[path.path] = value
+    return delta
+
+
+_MISSING = object()
+
+
+def _lookup(data: Any, parts) -> Any:
+    for part in parts:
+        if not isinstance(data, dict) or part not in data:
+            return _MISSING
+        data = data[part]
+    return data
+
+
+def _dumps(delta: Dict[str, Any]) -> bytes:
+    return json.dumps(delta, separators=(',', ':')).encode()
@@ -0,0 +1,157 @@
+import gzip
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .json_utils import _dump_instance, _validate_json, _validate_json_data, is_pydantic_model
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class SerializationFormat:
+    """
+    Serialization backend of :func:`~expergen.json_utils.save_to_directory`: turns an instance into the bytes of
+    its file and back. Formats are looked up by name (see :func:`register_format`) and recognized on load by the
+    file extension or, for compressed formats, by the leading magic bytes.
+    """
+    name = "json"
+    extension = ".json"
+    magic = b""
+    indent: Optional[int] = 4
+
+    def dumps(self, instance: Any, index: int, exclude_defaults: bool) -> bytes:
+        return _dump_instance(instance, index, exclude_defaults, indent=self.indent).encode()
+
+    def loads(self, data: bytes, model_type: Type[T]) -> T:
+        return _validate_json(data, model_type)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class CompactJsonFormat(SerializationFormat):
+    """
+    Single-line JSON without whitespace; loaded like any other JSON file.
+    """
+    name = "compact"
+    indent = None
+
+
+class CompressedJsonFormat(SerializationFormat):
+    """
+    Compact JSON compressed with a byte-level codec.
+    """
+    indent = None
+
+    def __init__(self, name: str, extension: str, magic: bytes, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]):
+        self.name = name
+        self.extension = extension
+        self.magic = magic
+        self._compress = compress
+        self._decompress = decompress
+
+    def dumps(self, instance: Any, index: int, exclude_defaults: bool) -> bytes:
+        return self._compress(super().dumps(instance, index, exclude_defaults))
+
+    def loads(self, data: bytes, model_type: Type[T]) -> T:
+        return super().loads(self._decompress(data), model_type)
+
+
+class MsgpackFormat(SerializationFormat):
+    """
+    MessagePack encoding of the JSON-compatible data (requires the ``msgpack`` package).
+    """
+    name = "msgpack"
+    extension = ".msgpack"
+
+    def dumps(self, instance: Any, index: int, exclude_defaults: bool) -> bytes:
+        if is_pydantic_model(instance):
+            data = instance.model_dump(mode="json", exclude_defaults=exclude_defaults)
+        else:
+            data = json.loads(_dump_instance(instance, index, exclude_defaults))
+        return _msgpack().packb(data, use_bin_type=True)
+
+    def loads(self, data: bytes, model_type: Type[T]) -> T:
+        return _validate_json_data(_msgpack().unpackb(data, raw=False), model_type)
+
+
+FORMATS: Dict[str, SerializationFormat] = {}
+
+
+def register_format(serialization_format: SerializationFormat) -> SerializationFormat:
+    """
+    Make a format available by its name to ``save_to_directory(..., format=name)`` and to format detection on load.
+    Registering a name again replaces the earlier format.
+    """
+    FORMATS[serialization_format.name] = serialization_format
+    return serialization_format
+
+
+def get_format(name: str) -> SerializationFormat:
+    if name not in FORMATS:
+        raise ValueError(f"Unknown format '{name}', expected one of {tuple(FORMATS)}")
+    return FORMATS[name]
+
+
+def detect_format(filename: str, data: bytes = b"") -> SerializationFormat:
+    """
+    Find the format of a file: by the magic bytes at the start of ``data`` if any format declares them,
+    otherwise by the longest registered extension ``filename`` ends with, otherwise JSON.
+    """
+    for serialization_format in FORMATS.values():
+        if serialization_format.magic and data.startswith(serialization_format.magic):
+            return serialization_format
+    matches = [f for f in FORMATS.values() if filename.endswith(f.extension)]
+    if matches:
+        return max(matches, key=lambda f: len(f.extension))
+    return FORMATS["json"]
+
+
+def extensions() -> Tuple[str, ...]:
+    """
+    File extensions of all registered formats.
+    """
+    return tuple(dict.fromkeys(f.extension for f in FORMATS.values()))
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError("The msgpack format requires msgpack, install it with 'pip install msgpack'") from e
+    return msgpack
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return _zstd()[0](data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return _zstd()[1](data)
+
+
+def _zstd() -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.compress, zstd.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("The zstd format requires zstandard, install it with 'pip install zstandard'") from e
+    # The streaming decompressor handles frames written without the content size as well.
+    return zstandard.ZstdCompressor().compress, lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _gzip_compress(data: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic, so identical configs produce identical files.
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+register_format(SerializationFormat())
+register_format(CompactJsonFormat())
+register_format(CompressedJsonFormat("gzip", ".json.gz", b"\x1f\x8b", _gzip_compress, gzip.decompress))
+register_format(CompressedJsonFormat("zstd", ".json.zst", b"\x28\xb5\x2f\xfd", _zstd_compress, _zstd_decompress))
+register_format(MsgpackFormat())
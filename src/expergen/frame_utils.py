@@ -0,0 +1,172 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .dataclass_utils import VariationSpace, generate_variations
+
+
+class ConfigFrame:
+    """
+    Columnar view of a sweep for vectorized filtering and analysis.
+
+    Every varied key is a column stored as an array of value codes (positions in the key's value table),
+    so filters and group-bys run in NumPy over integers instead of over Python objects. Rows refer to
+    combinations of the underlying :class:`~expergen.dataclass_utils.VariationSpace` and are turned back
+    into models only for the selected rows.
+
+    >>> frame = ConfigFrame.from_variations(base_config, variations)
+    >>> selected = frame[(frame["model.activation"] == "relu") & (frame["training.num_epochs"] >= 100)]
+    >>> configs = selected.to_models()
+    """
+
+    def __init__(self, space: VariationSpace, rows: np.ndarray = None, codes: Dict[str, np.ndarray] = None):
+        self.space = space
+        self.rows = np.arange(len(space), dtype=np.int64) if rows is None else rows
+        self._tables = {key: _value_table(axis) for key, axis in zip(space.keys, space.axes)}
+        self._codes = codes if codes is not None else {}
+
+    @classmethod
+    def from_variations(cls, instance: Any, variations: Dict[str, Iterable], transformations: Dict[str, Callable] = None, **kwargs) -> "ConfigFrame":
+        """
+        Build a frame directly from the arguments of :func:`~expergen.dataclass_utils.generate_variations`.
+        """
+        return cls(generate_variations(instance, variations, transformations, **kwargs))
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return self.space.keys
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, keys={list(self.keys)})"
+
+    def __getitem__(self, item: Union[str, np.ndarray, slice, List[int]]) -> Union[np.ndarray, "ConfigFrame"]:
+        """
+        ``frame[key]`` returns the decoded column of a key, anything else (boolean mask, positions, slice)
+        selects rows and returns a new frame.
+        """
+        if isinstance(item, str):
+            return self._tables[item][self.codes(item)]
+        return self.take(item)
+
+    def take(self, selection: Union[np.ndarray, slice, List[int]]) -> "ConfigFrame":
+        """
+        Select rows by boolean mask, positions or slice.
+        """
+        if not isinstance(selection, slice):
+            selection = np.asarray(selection)
+        codes = {key: column[selection] for key, column in self._codes.items()}
+        return ConfigFrame(self.space, self.rows[selection], codes)
+
+    def values(self, key: str) -> np.ndarray:
+        """
+        Table of the possible values of a key; ``codes(key)`` index into it.
+        """
+        return self._tables[key]
+
+    def codes(self, key: str) -> np.ndarray:
+        """
+        Value codes of a key for every row.
+        """
+        if key not in self._tables:
+            raise KeyError(f"'{key}' is not a varied field")
+        if key not in self._codes:
+            self._decode(key)
+        return self._codes[key]
+
+    def isin(self, key: str, values: Iterable[Any]) -> np.ndarray:
+        """
+        Boolean mask of rows whose value of ``key`` is one of ``values`` (compared on codes, works for any value type).
+        """
+        values = list(values)
+        wanted = [code for code, value in enumerate(self.space.axes[self.keys.index(key)]) if value in values]
+        return np.isin(self.codes(key), wanted)
+
+    def groupby(self, *keys: str) -> Dict[Any, "ConfigFrame"]:
+        """
+        Split the rows by the values of one or more keys.
+
+        :return: Dictionary from the value (or tuple of values for several keys) to the frame of its rows,
+            in the order of the value tables. Unhashable values are keyed by a hashable copy (lists become tuples).
+        """
+        radices = [len(self._tables[key]) for key in keys]
+        combined = np.ravel_multi_index([self.codes(key) for key in keys], radices) if keys else np.zeros(len(self), dtype=np.int64)
+        order = np.argsort(combined, kind='stable')
+        group_codes, starts = np.unique(combined[order], return_index=True)
+        groups = {}
+        for group_code, rows in zip(group_codes, np.split(order, starts[1:])):
+            value_codes = np.unravel_index(group_code, radices)
+            values = tuple(_hashable(self.space.axes[self.keys.index(key)][code]) for key, code in zip(keys, value_codes))
+            groups[values[0] if len(keys) == 1 else values] = self.take(rows)
+        return groups
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Decoded columns of all keys, e.g. for ``pandas.DataFrame(frame.columns(), index=frame.rows)``.
+        """
+        return {key: self[key] for key in self.keys}
+
+    def instances(self) -> Iterator[Any]:
+        """
+        Build the models of the selected rows one by one.
+        """
+        for row in self.rows:
+            yield self.space[int(row)]
+
+    def to_models(self) -> List[Any]:
+        """
+        Build the models of the selected rows.
+        """
+        return list(self.instances())
+
+    def _decode(self, key: str) -> None:
+        space = self.space
+        indices = space._index_range
+        if space.constraints:
+            # Constrained spaces have no closed-form decoding; walk the space once and keep all columns.
+            positions = np.array(list(space.positions()), dtype=np.int64).reshape(len(space), len(space.keys))
+            for column, name in enumerate(space.keys):
+                self._codes[name] = _narrow(positions[self.rows, column], len(space.axes[column]))
+            return
+        flat = indices.start + self.rows * indices.step
+        stride = 1
+        for name, axis in reversed(list(zip(space.keys, space.axes))):
+            if name == key:
+                self._codes[name] = _narrow((flat // stride) % len(axis), len(axis))
+                return
+            stride *= len(axis)
+
+
+def _value_table(axis: Tuple[Any, ...]) -> np.ndarray:
+    kinds = {type(value) for value in axis}
+    if len(kinds) == 1 and kinds <= {bool, int, float, str}:
+        try:
+            return np.array(axis)
+        except OverflowError:  # integers beyond int64
+            pass
+    table = np.empty(len(axis), dtype=object)
+    for position, value in enumerate(axis):
+        table[position] = value
+    return table
+
+
+def _hashable(value: Any) -> Any:
+    """
+    Hashable stand-in of a value: lists and tuples become tuples, dicts tuples of items and sets frozensets.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _hashable(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def _narrow(codes: np.ndarray, radix: int) -> np.ndarray:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if radix <= np.iinfo(dtype).max + 1:
+            return codes.astype(dtype)
+    return codes.astype(np.int64)
@@ -0,0 +1,92 @@
+import json
+import hashlib
+import weakref
+import dataclasses
+from typing import Any, Dict, Iterable, Iterator, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+T = TypeVar('T', bound=BaseModel)
+
+# id(instance) -> hash; entries are dropped when the instance is garbage collected.
+_hash_cache: Dict[int, str] = {}
+
+
+def config_hash(instance: Any, cache: bool = False) -> str:
+    """
+    Compute a stable content hash of a Pydantic model or dataclass config.
+    The hash is the SHA-256 of a canonical serialization: all fields including defaults, keys sorted
+    and integral floats written as integers, so it does not depend on field order or on whether
+    ``50`` or ``50.0`` was assigned to a float field.
+
+    Configs are mutable, so by default the hash is recomputed on every call. With ``cache=True`` it is stored per
+    instance, but only for deeply immutable configs (frozen models and dataclasses holding only frozen or
+    scalar values), which cannot change after hashing.
+
+    :param instance: Instance (Pydantic model or dataclass).
+    :param cache: Reuse and store the hash computed for this very instance if it is immutable.
+    :return: Hex digest of the hash.
+    """
+    cache = cache and _is_frozen(instance)
+    if cache:
+        digest = _hash_cache.get(id(instance))
+        if digest is not None:
+            return digest
+    digest = hashlib.sha256(canonical_json(instance).encode()).hexdigest()
+    if cache:
+        try:
+            weakref.finalize(instance, _hash_cache.pop, id(instance), None)
+        except TypeError:  # not weak-referenceable, e.g. slotted dataclasses
+            return digest
+        _hash_cache[id(instance)] = digest
+    return digest
+
+
+def canonical_json(instance: Any) -> str:
+    """
+    Serialize a config to the canonical JSON used by :func:`config_hash`.
+    """
+    return json.dumps(_canonical(to_jsonable_python(instance)), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def iter_unique(instances: Iterable[T]) -> Iterator[T]:
+    """
+    Yield the instances skipping those whose content equals an instance yielded before.
+    Only the hashes of the yielded instances are kept in memory.
+
+    :param instances: Iterable of instances (Pydantic models or dataclasses).
+    :return: Iterator of the first occurrence of every distinct config.
+    """
+    seen = set()
+    for instance in instances:
+        digest = config_hash(instance)
+        if digest not in seen:
+            seen.add(digest)
+            yield instance
+
+
+def _is_frozen(value: Any) -> bool:
+    """
+    Check that a value cannot be modified in place: scalars, tuples of frozen values and frozen models or dataclasses
+    whose field values are all frozen.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_frozen(item) for item in value)
+    if isinstance(value, BaseModel):
+        return bool(value.model_config.get("frozen")) and all(_is_frozen(item) for item in value.__dict__.values())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return value.__dataclass_params__.frozen and all(_is_frozen(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return False
+
+
+def _canonical(data: Any) -> Any:
+    if isinstance(data, float) and data.is_integer():
+        return int(data)
+    if isinstance(data, dict):
+        return {key: _canonical(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_canonical(value) for value in data]
+    return data
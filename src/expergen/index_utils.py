@@ -0,0 +1,132 @@
+import os
+import json
+import operator
+from typing import Any, Callable, Dict, List, Set, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from .json_utils import load_from_json
+
+T = TypeVar('T', bound=BaseModel)
+
+INDEX_FILE = ".expergen-index.json"
+INDEX_VERSION = 1
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "in": lambda value, options: value in options,
+}
+
+
+def query_directory(directory: str, model_type: Type[T], **conditions: Any) -> List[T]:
+    """
+    Load only the configs of a directory matching all conditions, using the index written by
+    ``save_to_directory(..., index=True)``.
+
+    Conditions are dotted paths written with double underscores, optionally followed by an operator
+    (``eq`` - the default, ``ne``, ``lt``, ``le``, ``gt``, ``ge``, ``in``)::
+
+        query_directory(directory, ExperimentConfig, model__activation="relu", training__num_epochs__ge=100)
+
+    Dotted paths can be passed by unpacking a dictionary: ``**{"training.num_epochs__ge": 100}``.
+
+    :param directory: Directory written by ``save_to_directory(..., index=True)``.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :param conditions: Field conditions that all have to hold.
+    :return: List of the matching instances, in the order they were saved.
+    """
+    index = SidecarIndex.load(directory)
+    positions = None
+    for condition, operand in conditions.items():
+        path, compare = _parse_condition(condition)
+        matching = index.lookup(path, lambda value: _safe_compare(compare, value, operand))
+        positions = matching if positions is None else positions & matching
+    if positions is None:
+        positions = set(range(len(index.files)))
+    filenames = dict.fromkeys(index.files[position] for position in sorted(positions))
+    return [load_from_json(os.path.join(directory, filename), model_type) for filename in filenames]
+
+
+class SidecarIndex:
+    """
+    Inverted index of a saved directory: dotted path -> JSON-encoded value -> positions of the instances.
+    Every leaf of the full config (including defaults) is indexed; lists are indexed as whole values.
+    """
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.paths: Dict[str, Dict[str, List[int]]] = {}
+
+    def add(self, position: int, filename: str, instance: Any) -> None:
+        if position >= len(self.files):
+            self.files.extend([None] * (position + 1 - len(self.files)))
+        self.files[position] = filename
+        for path, value in _flatten(to_jsonable_python(instance)):
+            self.paths.setdefault(path, {}).setdefault(json.dumps(value, sort_keys=True), []).append(position)
+
+    def merge(self, other: "SidecarIndex") -> None:
+        for position, filename in enumerate(other.files):
+            if filename is not None:
+                if position >= len(self.files):
+                    self.files.extend([None] * (position + 1 - len(self.files)))
+                self.files[position] = filename
+        for path, values in other.paths.items():
+            target = self.paths.setdefault(path, {})
+            for value, positions in values.items():
+                target.setdefault(value, []).extend(positions)
+
+    def lookup(self, path: str, predicate: Callable[[Any], bool]) -> Set[int]:
+        """
+        Positions of the instances whose value at ``path`` satisfies ``predicate``.
+        """
+        if path not in self.paths:
+            raise KeyError(f"Field '{path}' is not in the index")
+        positions = set()
+        for value, value_positions in self.paths[path].items():
+            if predicate(json.loads(value)):
+                positions.update(value_positions)
+        return positions
+
+    def save(self, directory: str) -> None:
+        with open(os.path.join(directory, INDEX_FILE), 'w') as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files, "paths": self.paths}, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, directory: str) -> "SidecarIndex":
+        path = os.path.join(directory, INDEX_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No index in '{directory}', save it with save_to_directory(..., index=True)")
+        with open(path) as f:
+            data = json.load(f)
+        index = cls()
+        index.files = data["files"]
+        index.paths = data["paths"]
+        return index
+
+
+def _flatten(data: Any, prefix: str = ''):
+    if isinstance(data, dict) and data:
+        for key, value in data.items():
+            yield from _flatten(value, f"{prefix}{key}.")
+    elif prefix:
+        yield prefix[:-1], data
+
+
+def _parse_condition(condition: str):
+    parts = condition.split('__')
+    if len(parts) > 1 and parts[-1] in OPERATORS:
+        return '.'.join(parts[:-1]), OPERATORS[parts[-1]]
+    return '.'.join(parts), OPERATORS["eq"]
+
+
+def _safe_compare(compare: Callable[[Any, Any], bool], value: Any, operand: Any) -> bool:
+    try:
+        return compare(value, operand)
+    except TypeError:  # e.g. ordering a string against a number
+        return False
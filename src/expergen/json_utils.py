@@ -1,10 +1,26 @@
 import os
 import json
-from typing import List, Type, TypeVar, Union, Any
-from pydantic import BaseModel
+import collections.abc
+import contextlib
+import math
+import re
+import fnmatch
+import functools
+import mmap
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterable, Iterator, Callable, Optional, Sequence, Tuple, Type, TypeVar, Union, Any
+import pydantic.dataclasses
+from pydantic import BaseModel, TypeAdapter
 from dataclasses import asdict, is_dataclass
 from pydantic.dataclasses import dataclass as pydantic_dataclass
 
+from .dataclass_utils import generate_variations
+from .hash_utils import config_hash
+from .profile_utils import Profiler
+from .shard_utils import shard_range
+
 T = TypeVar('T', bound=BaseModel)
 
 def is_pydantic_model(obj: Any) -> bool:
@@ -12,64 +28,339 @@ def is_pydantic_model(obj: Any) -> bool:
            (hasattr(obj, '__class__') and issubclass(obj.__class__, BaseModel))
 
 def is_pydantic_dataclass(obj: Any) -> bool:
-    return hasattr(obj, '__pydantic_model__')
+    return hasattr(obj, '__pydantic_model__') or pydantic.dataclasses.is_pydantic_dataclass(obj)
 
-def load_from_directory(directory: str, model_type: Type[T]) -> List[T]:
+def load_from_directory(directory: str, model_type: Type[T], pattern: Optional[str] = None, workers: Optional[int] = None, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: str = "contiguous") -> List[T]:
     """
     Load all JSON files from the specified directory and convert them to Pydantic model or dataclass instances.
+    Files are ordered by instance number (see :func:`iter_from_directory`).
     
     :param directory: Path to the directory containing JSON files.
     :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :param pattern: Glob pattern the file names have to match; by default files of any registered format.
+    :param workers: Number of threads parsing the files in parallel.
+    :param shard_index: Load only this shard of the files (see :func:`iter_from_directory`).
+    :param num_shards: Number of shards.
+    :param shard_strategy: ``"contiguous"`` or ``"strided"``.
     :return: List of instances of the specified type.
     """
-    instances = []
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory, filename)
-            instance = load_from_json(filepath, model_type)
-            instances.append(instance)
-    return instances
+    return list(iter_from_directory(directory, model_type, pattern=pattern, workers=workers,
+                                    shard_index=shard_index, num_shards=num_shards, shard_strategy=shard_strategy))
 
 
-def save_to_directory(instances: List[T], destination_dir: str, exclude_defaults = True) -> None:
+def iter_from_directory(directory: str, model_type: Type[T], pattern: Optional[str] = None, workers: Optional[int] = None, read_ahead: Optional[int] = None, processes: bool = False, shard_index: Optional[int] = None, num_shards: Optional[int] = None, shard_strategy: str = "contiguous") -> Iterator[T]:
+    """
+    Lazily load JSON files from the specified directory in a deterministic order.
+    ``instance_<n>.json`` files are yielded by instance number, other matching files follow sorted by name.
+    Hidden files (such as expergen's own metadata) are skipped. Files saved in another format than JSON
+    (see :mod:`~expergen.format_utils`) are recognized and decoded automatically.
+
+    With ``workers`` the files are parsed by a thread (or process) pool while earlier instances are consumed;
+    at most ``read_ahead`` files are in flight, so memory stays bounded.
+
+    :param directory: Path to the directory containing JSON files.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :param pattern: Glob pattern the file names have to match; by default files of any registered format.
+    :param workers: Number of threads (or processes) parsing the files; None parses in the calling thread.
+    :param read_ahead: Maximum number of files being parsed ahead of the consumer (defaults to ``2 * workers``).
+    :param processes: Use a process pool instead of threads; ``model_type`` must then be picklable.
+    :param shard_index: Load only this shard of the ordered files, without reading the others
+        (see :func:`~expergen.shard_utils.shard_range`; read from the environment if only ``num_shards`` is given).
+    :param num_shards: Number of shards.
+    :param shard_strategy: ``"contiguous"`` or ``"strided"``.
+    :return: Iterator of instances of the specified type.
+    """
+    filenames = list_instance_files(directory, pattern)
+    if shard_index is not None or num_shards is not None:
+        positions = shard_range(len(filenames), shard_index, num_shards, shard_strategy)
+        filenames = filenames[positions.start:positions.stop:positions.step]
+    filepaths = [os.path.join(directory, filename) for filename in filenames]
+    if not workers or workers <= 1:
+        for filepath in filepaths:
+            yield load_from_json(filepath, model_type)
+        return
+
+    read_ahead = max(1, read_ahead or 2 * workers)
+    executor_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_type(max_workers=workers) as executor:
+        pending = deque()
+        for filepath in filepaths:
+            if len(pending) >= read_ahead:
+                yield pending.popleft().result()
+            pending.append(executor.submit(load_from_json, filepath, model_type))
+        while pending:
+            yield pending.popleft().result()
+
+
+def list_instance_files(directory: str, pattern: Optional[str] = None) -> List[str]:
+    """
+    List the names of non-hidden files in ``directory`` matching ``pattern`` (by default: ending with the extension
+    of a registered format), ordered by instance number.
+    """
+    if pattern is None:
+        from .format_utils import extensions
+        suffixes = extensions()
+        matches = lambda name: name.endswith(suffixes)
+    else:
+        matches = lambda name: fnmatch.fnmatch(name, pattern)
+    filenames = [
+        entry.name for entry in os.scandir(directory)
+        if not entry.name.startswith('.') and matches(entry.name) and entry.is_file()
+    ]
+    return sorted(filenames, key=instance_sort_key)
+
+
+def save_to_directory(instances: Iterable[T], destination_dir: str, exclude_defaults = True, workers: Optional[int] = None, chunk_size: Optional[int] = None, naming: str = "index", index: bool = False, profiler: Optional[Profiler] = None, format: str = "json") -> None:
     """
     Save each instance as a separate JSON file in the specified directory.
     Supports both Pydantic models and regular dataclasses.
+
+    With ``workers`` the index range of ``instances`` is split into chunks which are built, serialized and written
+    by a process pool. Only the index ranges are sent to the workers (the sequence itself is inherited or sent once
+    per worker), so a lazy :class:`~expergen.dataclass_utils.VariationSpace` is never materialized in the parent.
+    The files and their numbering are identical to the serial output.
+
+    With ``naming="hash"`` files are named ``<config_hash>.json`` (see :func:`~expergen.hash_utils.config_hash`)
+    instead of ``instance_<n>.json``. Duplicate configs then map to the same file and configs that already exist
+    on disk (e.g. from a previous run of the same sweep) are skipped.
+
+    With ``index=True`` an inverted index (dotted path -> value -> instances) is saved alongside the files
+    as a hidden file, so :func:`~expergen.index_utils.query_directory` can load only the matching configs.
+
+    ``format`` selects the serialization backend (see :mod:`~expergen.format_utils`): indented ``"json"``,
+    ``"compact"`` JSON, ``"gzip"`` or ``"zstd"`` compressed JSON, or ``"msgpack"``. Loading detects the format.
+
+    With a :class:`~expergen.profile_utils.Profiler` the time spent serializing and writing, the bytes written and
+    the progress are recorded (pass the same profiler to ``generate_variations`` to also time building the instances).
+    Worker processes report their measurements when their chunk is done.
     
-    :param instances: List of instances (Pydantic models or dataclasses).
+    :param instances: List of instances (Pydantic models or dataclasses); parallel saving requires a sequence.
     :param destination_dir: Path to the directory where files will be saved.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :param workers: Number of worker processes; None or 1 saves in the current process.
+    :param chunk_size: Number of instances handed to a worker at once (derived from the size when None).
+    :param naming: ``"index"`` for ``instance_<n>.json`` or ``"hash"`` for content-addressed file names.
+    :param index: Save a query index alongside the files.
+    :param profiler: Profiler recording stage timings, counters and progress.
+    :param format: Name of the serialization format.
     """
+    from .format_utils import get_format
+    if naming not in NAMING_SCHEMES:
+        raise ValueError(f"Unknown naming '{naming}', expected one of {NAMING_SCHEMES}")
+    serialization_format = get_format(format)
     os.makedirs(destination_dir, exist_ok=True)
-    for index, instance in enumerate(instances, start=1):
-        filepath = os.path.join(destination_dir, f"instance_{index}.json")
-        if is_pydantic_model(instance):
-            json_data = instance.model_dump_json(indent=4, exclude_defaults=exclude_defaults)
-            with open(filepath, 'w') as f:
-                f.write(json_data)
-        elif is_dataclass(instance):
-            with open(filepath, 'w') as f:
-                json.dump(instance.model_dump(exclude_defaults=exclude_defaults), f, indent=4)
+    with profiler.stage("save_to_directory") if profiler is not None else contextlib.nullcontext():
+        if workers is not None and workers > 1 and isinstance(instances, collections.abc.Sequence) and len(instances) > 1:
+            total, written, sidecar = _save_parallel(instances, destination_dir, exclude_defaults, workers, chunk_size, naming, index, profiler, serialization_format)
         else:
-            raise TypeError(f"Instance {index} is neither a Pydantic model nor a dataclass")
-    print(f"Saved {len(instances)} files to '{destination_dir}'.")
+            expected = len(instances) if isinstance(instances, collections.abc.Sized) else None
+            total, written, sidecar = _save_positions(enumerate(instances), destination_dir, exclude_defaults, naming, index, profiler, expected, serialization_format)
+        if sidecar is not None:
+            sidecar.save(destination_dir)
+        if profiler is not None:
+            profiler.progress(total, total, final=True)
+    skipped = total - written
+    print(f"Saved {written} files to '{destination_dir}'." + (f" Skipped {skipped} existing." if skipped else ""))
+
+
+def generate_and_save(instance: Any, variations: Dict[str, Iterable], destination_dir: str, transformations: Dict[str, Callable] = None, exclude_defaults = True, workers: Optional[int] = None, chunk_size: Optional[int] = None, profiler: Optional[Profiler] = None) -> None:
+    """
+    Generate all variations of ``instance`` and save them to ``destination_dir`` in one pass.
+    Equivalent to ``save_to_directory(generate_variations(instance, variations, transformations), ...)``.
+
+    :param instance: Base instance (Pydantic model or dataclass).
+    :param variations: Dictionary where keys are field names (with dot notation for nested fields) and values are iterables of possible values.
+    :param destination_dir: Path to the directory where files will be saved.
+    :param transformations: Dictionary where keys are field names (with dot notation for nested fields) and values are callable transformations.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :param workers: Number of worker processes building and writing the instances.
+    :param chunk_size: Number of instances handed to a worker at once.
+    :param profiler: Profiler recording the building, serialization and writing of the instances.
+    """
+    space = generate_variations(instance, variations, transformations, profiler=profiler)
+    save_to_directory(space, destination_dir, exclude_defaults=exclude_defaults, workers=workers, chunk_size=chunk_size, profiler=profiler)
+
+
+NAMING_SCHEMES = ("index", "hash")
+
+
+def _save_instance(instance: T, index: int, destination_dir: str, exclude_defaults: bool, naming: str = "index", profiler: Optional[Profiler] = None, serialization_format: Any = None) -> Tuple[str, bool]:
+    """
+    Save one instance (as indented JSON unless another :class:`~expergen.format_utils.SerializationFormat` is given);
+    returns its file name and whether it was written (False if skipped as existing).
+    """
+    if serialization_format is None:
+        from .format_utils import get_format
+        serialization_format = get_format("json")
+    if naming == "hash":
+        filename = f"{config_hash(instance)}{serialization_format.extension}"
+        if os.path.exists(os.path.join(destination_dir, filename)):
+            return filename, False
+    else:
+        filename = f"instance_{index}{serialization_format.extension}"
+    if profiler is None:
+        data = serialization_format.dumps(instance, index, exclude_defaults)
+        with open(os.path.join(destination_dir, filename), 'wb') as f:
+            f.write(data)
+        return filename, True
+    with profiler.stage("serialize"):
+        data = serialization_format.dumps(instance, index, exclude_defaults)
+    with profiler.stage("write"):
+        with open(os.path.join(destination_dir, filename), 'wb') as f:
+            f.write(data)
+    profiler.count("bytes_written", len(data))
+    return filename, True
 
 
-def load_from_json(filepath: str, model_type: Type[T]) -> T:
+def _save_positions(positioned: Iterable[Tuple[int, T]], destination_dir: str, exclude_defaults: bool, naming: str, build_index: bool, profiler: Optional[Profiler] = None, expected: Optional[int] = None, serialization_format: Any = None) -> Tuple[int, int, Any]:
+    """
+    Save ``(position, instance)`` pairs; returns the number of instances, the number of written files
+    and the query index of the saved instances (None unless ``build_index``).
+    ``expected`` is the total number of instances reported to the progress callbacks.
+    """
+    sidecar = None
+    if build_index:
+        from .index_utils import SidecarIndex
+        sidecar = SidecarIndex()
+    total = written = 0
+    if profiler is not None:
+        for position, instance in positioned:
+            filename, was_written = _save_instance(instance, position + 1, destination_dir, exclude_defaults, naming, profiler, serialization_format)
+            if sidecar is not None:
+                with profiler.stage("index"):
+                    sidecar.add(position, filename, instance)
+            total += 1
+            written += was_written
+            profiler.count("instances")
+            profiler.count("files_written" if was_written else "skipped")
+            profiler.progress(total, expected)
+        return total, written, sidecar
+    for position, instance in positioned:
+        filename, was_written = _save_instance(instance, position + 1, destination_dir, exclude_defaults, naming, None, serialization_format)
+        if sidecar is not None:
+            sidecar.add(position, filename, instance)
+        total += 1
+        written += was_written
+    return total, written, sidecar
+
+
+def _dump_instance(instance: T, index: int, exclude_defaults: bool, indent: Optional[int] = None) -> str:
+    """
+    Serialize an instance to a JSON string; ``indent=None`` produces compact single-line JSON.
+    """
+    if is_pydantic_model(instance):
+        return instance.model_dump_json(indent=indent, exclude_defaults=exclude_defaults)
+    elif is_dataclass(instance):
+        separators = None if indent is not None else (',', ':')
+        return json.dumps(instance.model_dump(exclude_defaults=exclude_defaults), indent=indent, separators=separators)
+    else:
+        raise TypeError(f"Instance {index} is neither a Pydantic model nor a dataclass")
+
+
+def instance_sort_key(filename: str) -> Tuple[int, Union[int, float], str]:
+    """
+    Sort key ordering ``instance_<n>.json`` files by instance number; other files follow, sorted by name.
+    """
+    match = _INSTANCE_NUMBER.match(filename)
+    if match:
+        return (0, int(match.group(1)), filename)
+    return (1, math.inf, filename)
+
+
+_INSTANCE_NUMBER = re.compile(r'instance_(\d+)\.')
+
+
+_worker_instances = None
+
+
+def _init_save_worker(instances: Sequence[T]) -> None:
+    global _worker_instances
+    _worker_instances = instances
+
+
+def _save_range(start: int, stop: int, destination_dir: str, exclude_defaults: bool, naming: str, build_index: bool, profile: bool, serialization_format: Any = None) -> Tuple[int, int, Any, Optional[Profiler]]:
+    profiler = None
+    if profile:
+        # A fresh profiler per chunk, returned to the parent and merged there.
+        profiler = Profiler()
+        if getattr(_worker_instances, 'profiler', None) is not None:
+            _worker_instances.profiler = profiler
+    positioned = ((position, _worker_instances[position]) for position in range(start, stop))
+    return (*_save_positions(positioned, destination_dir, exclude_defaults, naming, build_index, profiler, None, serialization_format), profiler)
+
+
+def _save_parallel(instances: Sequence[T], destination_dir: str, exclude_defaults: bool, workers: int, chunk_size: Optional[int], naming: str, build_index: bool, profiler: Optional[Profiler] = None, serialization_format: Any = None) -> Tuple[int, int, Any]:
+    total = len(instances)
+    if chunk_size is None:
+        chunk_size = max(1, min(1000, math.ceil(total / (workers * 4))))
+    # Fork lets the workers inherit the instances (including lambdas in transformations) without pickling.
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_save_worker, initargs=(instances,)) as executor:
+        futures = [
+            executor.submit(_save_range, start, min(start + chunk_size, total), destination_dir, exclude_defaults, naming, build_index, profiler is not None, serialization_format)
+            for start in range(0, total, chunk_size)
+        ]
+        done = written = 0
+        sidecar = None
+        for future in as_completed(futures):
+            chunk_total, chunk_written, chunk_sidecar, chunk_profiler = future.result()
+            done += chunk_total
+            written += chunk_written
+            if profiler is not None:
+                profiler.merge(chunk_profiler)
+                profiler.progress(done, total)
+            if chunk_sidecar is not None:
+                if sidecar is None:
+                    sidecar = chunk_sidecar
+                else:
+                    sidecar.merge(chunk_sidecar)
+        return total, written, sidecar
+
+
+def load_from_json(filepath: str, model_type: Type[T], use_mmap: bool = False, format: Optional[str] = None) -> T:
     """
     Load a JSON file and convert it to a Pydantic model instance, Pydantic dataclass instance, or a regular dataclass instance.
+    The raw bytes are validated directly by pydantic-core, using a validator cached per ``model_type``.
+    Compressed and msgpack files written with ``save_to_directory(..., format=...)`` are detected by their magic
+    bytes or extension and decoded first (see :func:`~expergen.format_utils.detect_format`).
     
     :param filepath: Path to the JSON file.
     :param model_type: The type to convert the JSON data into (Pydantic model, Pydantic dataclass, or regular dataclass).
+    :param use_mmap: Read the file through a memory map instead of buffered reads (useful for large files).
+    :param format: Name of the serialization format, detected when None.
     :return: Instance of the specified type.
     """
-    with open(filepath, 'r') as f:
-        json_data = json.load(f)
-    
+    from .format_utils import detect_format, get_format
+    with open(filepath, 'rb') as f:
+        if use_mmap and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # pydantic-core accepts only bytes, so the mapping is copied once in a single slice
+                json_data = mapped[:]
+        else:
+            json_data = f.read()
+    serialization_format = get_format(format) if format is not None else detect_format(filepath, json_data)
+    return serialization_format.loads(json_data, model_type)
+
+
+def _validate_json(json_data: Union[str, bytes], model_type: Type[T]) -> T:
+    return _json_validators(model_type)[0](json_data)
+
+
+def _validate_json_data(json_data: Any, model_type: Type[T]) -> T:
+    return _json_validators(model_type)[1](json_data)
+
+
+@functools.lru_cache(maxsize=None)
+def _json_validators(model_type: Type[T]) -> Tuple[Callable[[Union[str, bytes]], T], Callable[[Any], T]]:
+    """
+    Build (once per type) the validators turning raw JSON and already parsed Python data into ``model_type``.
+    """
     if is_pydantic_model(model_type):
-        return model_type.model_validate(json_data)
+        return model_type.model_validate_json, model_type.model_validate
     elif is_pydantic_dataclass(model_type):
-        return model_type(**json_data)
+        adapter = TypeAdapter(model_type)
     elif is_dataclass(model_type):
-        return pydantic_dataclass(model_type)(**json_data)
+        adapter = TypeAdapter(pydantic_dataclass(model_type))
     else:
         raise TypeError(f"{model_type} is neither a Pydantic model, Pydantic dataclass, nor a regular dataclass")
+    return adapter.validate_json, adapter.validate_python
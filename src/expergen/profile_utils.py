@@ -0,0 +1,146 @@
+import time
+import contextlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+TRANSFORM_PREFIX = "transform:"
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of sweep pipelines: per-stage timers, counters and progress callbacks.
+
+    Pass a profiler to :func:`~expergen.dataclass_utils.generate_variations` and/or
+    :func:`~expergen.json_utils.save_to_directory`; without one they run their uninstrumented code paths.
+
+    Stages recorded by the library (stages may be nested, e.g. ``build`` contains ``copy``):
+
+    - ``build`` - building an instance, split into ``copy``, ``assign`` (setting and checking varied values),
+      ``batch_transformations``, ``transform:<field>`` (one per transformation) and ``type_check``
+    - ``serialize`` and ``write`` - dumping an instance to JSON and writing its file
+    - ``index`` - adding an instance to the query index
+    - ``save_to_directory`` - the whole call, including the worker processes
+
+    Counters: ``built``, ``instances``, ``files_written``, ``skipped`` and ``bytes_written``.
+
+    >>> profiler = Profiler(callbacks=[lambda done, total, profiler: print(f"{done}/{total}")], every=1000)
+    >>> save_to_directory(generate_variations(base, variations, profiler=profiler), "out", profiler=profiler)
+    >>> print(profiler.summary())
+
+    :param callbacks: Progress callbacks, called as ``callback(done, total, profiler)``; ``total`` is None for iterators.
+    :param every: Report progress after every ``every`` instances (and always at the end).
+    """
+
+    def __init__(self, callbacks: Iterable[Callable[[int, Optional[int], "Profiler"], None]] = (), every: int = 1):
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}")
+        self.callbacks: List[Callable[[int, Optional[int], "Profiler"], None]] = list(callbacks)
+        self.every = every
+        self.timings: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._reported = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Callbacks (often lambdas) stay in the parent process; workers only return their measurements.
+        state = dict(self.__dict__)
+        state["callbacks"] = []
+        return state
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as stage ``name``.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, start)
+
+    def add(self, name: str, seconds: float, start: Optional[float] = None) -> None:
+        """
+        Record ``seconds`` spent in stage ``name``.
+        """
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+        now = time.perf_counter()
+        start = now - seconds if start is None else start
+        if self._first is None or start < self._first:
+            self._first = start
+        self._last = now
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def progress(self, done: int, total: Optional[int] = None, final: bool = False) -> None:
+        """
+        Notify the callbacks once at least ``every`` instances were done since the last notification, and when ``final`` is set.
+        """
+        if self.callbacks and (done - self._reported >= self.every or (final and done != self._reported)):
+            self._reported = done
+            for callback in self.callbacks:
+                callback(done, total, self)
+
+    def merge(self, other: "Profiler") -> None:
+        """
+        Add the measurements of another profiler, e.g. one filled by a worker process.
+        """
+        for name, seconds in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, calls in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + calls
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Wall time from the start of the first recorded stage to the end of the last one.
+        """
+        return 0.0 if self._first is None else self._last - self._first
+
+    def report(self, top: int = 5) -> Dict[str, Any]:
+        """
+        Summarize the measurements.
+
+        :param top: Number of slowest transformations to list.
+        :return: Dictionary with the elapsed time, instances, throughput (instances per second), bytes written,
+            per-stage totals (seconds, calls, mean) sorted by time and the slowest transformations.
+        """
+        instances = self.counters.get("instances", self.counters.get("built", 0))
+        elapsed = self.elapsed
+        stages = {
+            name: {"seconds": seconds, "calls": self.calls[name], "mean": seconds / self.calls[name]}
+            for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])
+        }
+        transforms = [(name[len(TRANSFORM_PREFIX):], stage) for name, stage in stages.items() if name.startswith(TRANSFORM_PREFIX)]
+        return {
+            "elapsed": elapsed,
+            "instances": instances,
+            "throughput": instances / elapsed if elapsed else 0.0,
+            "bytes_written": self.counters.get("bytes_written", 0),
+            "counters": dict(self.counters),
+            "stages": stages,
+            "slowest_transforms": transforms[:top],
+        }
+
+    def summary(self, top: int = 5) -> str:
+        """
+        Human readable version of :meth:`report`.
+        """
+        report = self.report(top)
+        lines = [f"{report['instances']} instances in {report['elapsed']:.3f} s ({report['throughput']:.1f}/s)"]
+        if report["bytes_written"]:
+            megabytes = report["bytes_written"] / 2 ** 20
+            rate = megabytes / report["elapsed"] if report["elapsed"] else 0.0
+            lines.append(f"{megabytes:.2f} MiB written ({rate:.2f} MiB/s)")
+        for name, stage in report["stages"].items():
+            lines.append(f"  {name:<30} {stage['seconds']:10.4f} s {stage['calls']:>10} calls {stage['mean'] * 1e6:10.1f} us/call")
+        if report["slowest_transforms"]:
+            lines.append("Slowest transformations: " + ", ".join(f"{name} ({stage['seconds']:.4f} s)" for name, stage in report["slowest_transforms"]))
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
@@ -0,0 +1,122 @@
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .dataclass_utils import VariationSpace, is_distribution, distribution_value
+
+SAMPLING_METHODS = ("random", "lhs", "sobol")
+
+
+class Uniform:
+    """
+    Continuous uniform distribution over ``[low, high)`` to be used as a variation axis in :func:`sample_variations`.
+    With ``log=True`` the values are uniform in log space (e.g. for learning rates).
+    Any other object with a ``ppf`` method, such as a frozen ``scipy.stats`` distribution, works as well.
+    """
+
+    def __init__(self, low: float, high: float, log: bool = False):
+        if not low < high:
+            raise ValueError(f"low must be smaller than high, got {low} and {high}")
+        if log and low <= 0:
+            raise ValueError(f"log-uniform distribution needs a positive lower bound, got {low}")
+        self.low = low
+        self.high = high
+        self.log = log
+
+    def ppf(self, quantile: float) -> float:
+        if self.log:
+            return self.low * (self.high / self.low) ** quantile
+        return self.low + (self.high - self.low) * quantile
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.low}, {self.high}{', log=True' if self.log else ''})"
+
+
+def sample_variations(instance: Any, variations: Dict[str, Any], n: int, method: str = "random", seed: Optional[int] = None, transformations: Dict[str, Callable] = None, deep_copy: bool = False) -> List[Any]:
+    """
+    Draw ``n`` variations of the instance without enumerating the cartesian product.
+    The cost is proportional to ``n`` (and the number of axes), not to the size of the variation space.
+
+    Methods:
+
+    - ``"random"``: uniform sampling. If all axes are discrete, distinct combinations are drawn without replacement.
+    - ``"lhs"``: Latin hypercube; every axis is split into ``n`` strata and each stratum is used exactly once,
+      so discrete values are covered as evenly as possible.
+    - ``"sobol"``: scrambled Sobol low-discrepancy sequence (requires scipy).
+
+    :param instance: Instance of the dataclass.
+    :param variations: Dictionary where keys are field names (with dot notation for nested fields) and values are
+        iterables of possible values or continuous distributions (see :class:`Uniform`).
+    :param n: Number of instances to draw.
+    :param method: One of ``"random"``, ``"lhs"`` or ``"sobol"``.
+    :param seed: Seed making the sample reproducible.
+    :param transformations: Dictionary where keys are field names (with dot notation for nested fields) and values are callable transformations.
+    :param deep_copy: Deep-copy the base instance for every sample instead of sharing untouched subtrees.
+    :return: List of sampled instances.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method '{method}', expected one of {SAMPLING_METHODS}")
+    if n < 0:
+        raise ValueError(f"n must be non-negative, got {n}")
+    space = VariationSpace(instance, variations, transformations, deep_copy=deep_copy)
+
+    if method == "random" and not space.continuous:
+        return [space[index] for index in random.Random(seed).sample(range(len(space)), n)]
+
+    if method == "random":
+        rng = random.Random(seed)
+        points = [[rng.random() for _ in space.axes] for _ in range(n)]
+    elif method == "lhs":
+        points = latin_hypercube(n, len(space.axes), seed)
+    else:
+        points = sobol(n, len(space.axes), seed)
+    return [space._build(_combination(space.axes, point)) for point in points]
+
+
+def latin_hypercube(n: int, dimensions: int, seed: Optional[int] = None) -> List[List[float]]:
+    """
+    Latin hypercube sample of ``n`` points in the unit hypercube.
+
+    :param n: Number of points.
+    :param dimensions: Number of dimensions.
+    :param seed: Seed making the sample reproducible.
+    :return: List of points, each a list of ``dimensions`` coordinates in [0, 1).
+    """
+    rng = random.Random(seed)
+    columns = []
+    for _ in range(dimensions):
+        strata = list(range(n))
+        rng.shuffle(strata)
+        columns.append([(stratum + rng.random()) / n for stratum in strata])
+    return [list(point) for point in zip(*columns)] if dimensions else [[] for _ in range(n)]
+
+
+def sobol(n: int, dimensions: int, seed: Optional[int] = None) -> List[List[float]]:
+    """
+    Scrambled Sobol sample of ``n`` points in the unit hypercube (powers of two keep the sequence balanced).
+
+    :param n: Number of points.
+    :param dimensions: Number of dimensions.
+    :param seed: Seed of the scrambling.
+    :return: List of points, each a list of ``dimensions`` coordinates in [0, 1).
+    """
+    try:
+        from scipy.stats import qmc
+    except ImportError as e:
+        raise ImportError("Sobol sampling requires scipy, install it with 'pip install scipy'") from e
+    if not dimensions:
+        return [[] for _ in range(n)]
+    try:
+        sampler = qmc.Sobol(d=dimensions, scramble=True, rng=seed)
+    except TypeError:  # scipy < 1.15
+        sampler = qmc.Sobol(d=dimensions, scramble=True, seed=seed)
+    return sampler.random(n).tolist()
+
+
+def _combination(axes: Sequence[Any], point: Iterable[float]) -> tuple:
+    """
+    Map a point of the unit hypercube to one value per axis.
+    """
+    return tuple(
+        distribution_value(axis, quantile) if is_distribution(axis) else axis[min(int(quantile * len(axis)), len(axis) - 1)]
+        for axis, quantile in zip(axes, point)
+    )
@@ -0,0 +1,93 @@
+import os
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+SHARD_STRATEGIES = ("contiguous", "strided")
+
+# (rank, world size) environment variables of common schedulers and launchers, checked in this order.
+SHARD_ENVIRONMENT = (
+    ("EXPERGEN_SHARD_INDEX", "EXPERGEN_NUM_SHARDS"),
+    ("SLURM_ARRAY_TASK_ID", "SLURM_ARRAY_TASK_COUNT"),
+    ("SLURM_PROCID", "SLURM_NTASKS"),
+    ("OMPI_COMM_WORLD_RANK", "OMPI_COMM_WORLD_SIZE"),
+    ("PMI_RANK", "PMI_SIZE"),
+    ("RANK", "WORLD_SIZE"),
+)
+
+
+def shard_from_env() -> Tuple[int, int]:
+    """
+    Read the shard index and number of shards of the current task from the environment
+    (expergen's own variables, Slurm array jobs and tasks, Open MPI, PMI or torchrun).
+    Slurm array task ids are made zero-based using ``SLURM_ARRAY_TASK_MIN``.
+
+    :return: Tuple ``(shard_index, num_shards)``; ``(0, 1)`` if no variables are set.
+    """
+    return _read_env() or (0, 1)
+
+
+def _read_env() -> Optional[Tuple[int, int]]:
+    for index_variable, count_variable in SHARD_ENVIRONMENT:
+        if index_variable in os.environ and count_variable in os.environ:
+            shard_index = int(os.environ[index_variable])
+            if index_variable == "SLURM_ARRAY_TASK_ID":
+                shard_index -= int(os.environ.get("SLURM_ARRAY_TASK_MIN", 0))
+            return shard_index, int(os.environ[count_variable])
+    return None
+
+
+def shard_range(total: int, shard_index: Optional[int] = None, num_shards: Optional[int] = None, strategy: str = "contiguous") -> range:
+    """
+    Deterministically select the positions of one shard out of ``total`` items.
+
+    :param total: Number of items.
+    :param shard_index: Zero-based index of the shard; read from the environment if None,
+        which is an error if ``num_shards`` is given but no shard variable is set.
+    :param num_shards: Number of shards; read from the environment if None.
+    :param strategy: ``"contiguous"`` for blocks of consecutive items (sizes differ by at most one)
+        or ``"strided"`` for every ``num_shards``-th item.
+    :return: Range of the selected positions.
+    """
+    shard_index, num_shards = _resolve(shard_index, num_shards)
+    if strategy == "strided":
+        return range(shard_index, total, num_shards)
+    if strategy != "contiguous":
+        raise ValueError(f"Unknown shard strategy '{strategy}', expected one of {SHARD_STRATEGIES}")
+    size, remainder = divmod(total, num_shards)
+    start = shard_index * size + min(shard_index, remainder)
+    return range(start, start + size + (shard_index < remainder))
+
+
+def balanced_shard_range(costs: Iterable[float], shard_index: Optional[int] = None, num_shards: Optional[int] = None) -> range:
+    """
+    Select a contiguous block of items whose total cost is as close as possible to an equal share.
+    Every task computes the same cumulative costs, so the blocks are consistent without communication.
+
+    :param costs: Non-negative cost of every item, in order.
+    :param shard_index: Zero-based index of the shard; read from the environment if None.
+    :param num_shards: Number of shards; read from the environment if None.
+    :return: Range of the selected positions.
+    """
+    shard_index, num_shards = _resolve(shard_index, num_shards)
+    cumulative = np.cumsum(np.fromiter(costs, dtype=float))
+    if not len(cumulative):
+        return range(0)
+    bounds = np.searchsorted(cumulative, cumulative[-1] * np.arange(1, num_shards) / num_shards, side='right')
+    bounds = [0, *bounds.tolist(), len(cumulative)]
+    return range(bounds[shard_index], bounds[shard_index + 1])
+
+
+def _resolve(shard_index: Optional[int], num_shards: Optional[int]) -> Tuple[int, int]:
+    if shard_index is None or num_shards is None:
+        env = _read_env()
+        if env is None and num_shards is not None:
+            # Every task would silently select shard 0 and the other shards would never be written.
+            raise ValueError(f"num_shards={num_shards} given without shard_index and no shard variable is set in the environment "
+                             f"(one of {', '.join(index_variable for index_variable, _ in SHARD_ENVIRONMENT)})")
+        env_index, env_count = env or (0, 1)
+        shard_index = env_index if shard_index is None else shard_index
+        num_shards = env_count if num_shards is None else num_shards
+    if num_shards < 1 or not 0 <= shard_index < num_shards:
+        raise ValueError(f"Invalid shard {shard_index} of {num_shards}")
+    return shard_index, num_shards
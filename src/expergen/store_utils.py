@@ -0,0 +1,223 @@
+import os
+import json
+import glob
+import struct
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Type, TypeVar, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from .json_utils import _dump_instance, _validate_json, list_instance_files
+from .shard_utils import shard_range
+
+T = TypeVar('T', bound=BaseModel)
+
+STORE_METADATA = "store.json"
+STORE_INDEX = "index.bin"
+STORE_FORMAT = "expergen-store"
+STORE_VERSION = 1
+
+# One record per instance: byte offset inside its shard and length of the JSON line (without the newline).
+_INDEX_DTYPE = np.dtype('<u8')
+_INDEX_RECORD = struct.Struct('<QQ')
+
+
+def save_to_store(instances: Iterable[T], store_dir: str, shard_size: int = 10000, exclude_defaults = True) -> int:
+    """
+    Save instances to a single store: newline-delimited JSON shards plus a binary offset index.
+    Unlike :func:`~expergen.json_utils.save_to_directory` this creates only a handful of files regardless of the
+    number of instances. Instance ``n`` of ``save_to_directory`` corresponds to ``store[n - 1]``.
+
+    :param instances: Iterable of instances (Pydantic models or dataclasses), consumed once.
+    :param store_dir: Directory of the store; an existing store in it is replaced.
+    :param shard_size: Number of instances per shard file.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :return: Number of saved instances.
+    """
+    with StoreWriter(store_dir, shard_size) as writer:
+        for index, instance in enumerate(instances, start=1):
+            writer.write(_dump_instance(instance, index, exclude_defaults).encode())
+    print(f"Saved {writer.count} instances to store '{store_dir}'.")
+    return writer.count
+
+
+def open_store(store_dir: str, model_type: Type[T]) -> "ConfigStore[T]":
+    """
+    Open a store written by :func:`save_to_store` for random access and sequential streaming.
+
+    :param store_dir: Directory of the store.
+    :param model_type: The type to convert the JSON data into (Pydantic model or dataclass).
+    :return: ConfigStore of the specified type.
+    """
+    return ConfigStore(store_dir, model_type)
+
+
+def convert_directory_to_store(directory: str, store_dir: str, shard_size: int = 10000) -> int:
+    """
+    Convert a directory written by :func:`~expergen.json_utils.save_to_directory` into a store.
+    Files are ordered by instance number and re-serialized as compact JSON without validation.
+
+    :param directory: Path to the directory containing JSON files.
+    :param store_dir: Directory of the new store.
+    :param shard_size: Number of instances per shard file.
+    :return: Number of converted files.
+    """
+    filenames = list_instance_files(directory, '*.json')
+    with StoreWriter(store_dir, shard_size) as writer:
+        for filename in filenames:
+            with open(os.path.join(directory, filename), 'rb') as f:
+                json_data = json.load(f)
+            writer.write(json.dumps(json_data, separators=(',', ':')).encode())
+    print(f"Converted {writer.count} files from '{directory}' to store '{store_dir}'.")
+    return writer.count
+
+
+class StoreWriter:
+    """
+    Appends JSON records to the shards of a store. The metadata file is written on close,
+    so a store without it is incomplete.
+    """
+
+    def __init__(self, store_dir: str, shard_size: int = 10000, metadata: Optional[dict] = None):
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be positive, got {shard_size}")
+        self.store_dir = store_dir
+        self.shard_size = shard_size
+        self.metadata = metadata or {}
+        self.count = 0
+        self._shard = None
+        self._offset = 0
+
+        os.makedirs(store_dir, exist_ok=True)
+        for path in [os.path.join(store_dir, STORE_METADATA), *glob.glob(os.path.join(store_dir, "shard_*.jsonl"))]:
+            if os.path.exists(path):
+                os.remove(path)
+        self._index = open(os.path.join(store_dir, STORE_INDEX), 'wb')
+
+    def write(self, record: bytes) -> None:
+        if self.count % self.shard_size == 0:
+            if self._shard is not None:
+                self._shard.close()
+            self._shard = open(os.path.join(self.store_dir, _shard_name(self.count // self.shard_size)), 'wb')
+            self._offset = 0
+        self._shard.write(record)
+        self._shard.write(b'\n')
+        self._index.write(_INDEX_RECORD.pack(self._offset, len(record)))
+        self._offset += len(record) + 1
+        self.count += 1
+
+    def close(self, complete: bool = True) -> None:
+        """
+        Close the files and, if ``complete``, write the metadata that marks the store as readable.
+        """
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
+        self._index.close()
+        if not complete:
+            return
+        metadata = {"format": STORE_FORMAT, "version": STORE_VERSION, "count": self.count, "shard_size": self.shard_size}
+        with open(os.path.join(self.store_dir, STORE_METADATA), 'w') as f:
+            json.dump({**self.metadata, **metadata}, f, indent=4)
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close(complete=exc_info[0] is None)
+
+
+class ConfigStore(Sequence):
+    """
+    Read-only view of a store. ``store[i]`` seeks directly to the i-th record using the offset index,
+    iteration streams the shards sequentially. Only the index is memory-mapped; records are read on demand.
+    """
+
+    def __init__(self, store_dir: str, model_type: Type[T]):
+        self.store_dir = store_dir
+        self.model_type = model_type
+        with open(os.path.join(store_dir, STORE_METADATA)) as f:
+            self.metadata = json.load(f)
+        if self.metadata.get("format") != STORE_FORMAT:
+            raise ValueError(f"'{store_dir}' is not an expergen store")
+        self.shard_size = self.metadata["shard_size"]
+        self._count = self.metadata["count"]
+        if self._count:
+            self._index = np.memmap(os.path.join(store_dir, STORE_INDEX), dtype=_INDEX_DTYPE, mode='r', shape=(self._count, 2))
+        else:
+            self._index = np.empty((0, 2), dtype=_INDEX_DTYPE)
+        self._shards = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        return self._validate(self.read_bytes(index))
+
+    def __iter__(self) -> Iterator[T]:
+        for record in self.iter_bytes():
+            yield self._validate(record)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.store_dir!r}, len={self._count})"
+
+    def shard(self, shard_index: Optional[int] = None, num_shards: Optional[int] = None, strategy: str = "contiguous") -> Iterator[T]:
+        """
+        Iterate over one shard of the store, reading only that shard's records
+        (see :func:`~expergen.shard_utils.shard_range`).
+        """
+        for index in shard_range(self._count, shard_index, num_shards, strategy):
+            yield self[index]
+
+    def read_bytes(self, index: int) -> bytes:
+        """
+        Return the raw JSON record of the instance at ``index`` without validating it.
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("store index out of range")
+        offset, length = self._index[index]
+        shard = self._shard(index // self.shard_size)
+        shard.seek(int(offset))
+        return shard.read(int(length))
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Stream the raw JSON records of all instances in order.
+        """
+        remaining = self._count
+        for shard_number in range(-(-self._count // self.shard_size)):
+            with open(os.path.join(self.store_dir, _shard_name(shard_number)), 'rb') as f:
+                for line in f:
+                    if remaining == 0:
+                        return
+                    remaining -= 1
+                    yield line.rstrip(b'\n')
+
+    def close(self) -> None:
+        for shard in self._shards.values():
+            shard.close()
+        self._shards.clear()
+
+    def __enter__(self) -> "ConfigStore[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _shard(self, shard_number: int):
+        shard = self._shards.get(shard_number)
+        if shard is None:
+            shard = self._shards[shard_number] = open(os.path.join(self.store_dir, _shard_name(shard_number)), 'rb')
+        return shard
+
+    def _validate(self, record: bytes) -> T:
+        return _validate_json(record, self.model_type)
+
+
+def _shard_name(shard_number: int) -> str:
+    return f"shard_{shard_number:05d}.jsonl"
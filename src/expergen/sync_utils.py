@@ -0,0 +1,111 @@
+import os
+import json
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterable, List, TypeVar
+
+from pydantic import BaseModel
+
+from .hash_utils import config_hash
+from .json_utils import _dump_instance, list_instance_files, instance_sort_key
+
+T = TypeVar('T', bound=BaseModel)
+
+MANIFEST = ".expergen-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class SyncReport:
+    """
+    Outcome of :func:`sync_directory`; all lists contain file names.
+    """
+    added: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    stale: List[str] = field(default_factory=list)
+    removed: bool = False
+
+
+def sync_directory(instances: Iterable[T], destination_dir: str, exclude_defaults = True, remove_stale: bool = False) -> SyncReport:
+    """
+    Incrementally save instances to a directory, writing only configs that are not there yet.
+
+    A manifest (hidden file in the directory) maps the content hash of every saved config to its instance number.
+    A config keeps its ``instance_<n>.json`` file across edits of the sweep, new configs get numbers after the
+    highest one used so far, and configs no longer in the sweep are reported as stale (and deleted with
+    ``remove_stale``). Files and the manifest are written to a temporary file and renamed into place, so
+    concurrent readers never see partially written JSON.
+
+    :param instances: Iterable of instances (Pydantic models or dataclasses).
+    :param destination_dir: Path to the directory where files will be saved.
+    :param exclude_defaults: Omit fields that are equal to their default values.
+    :param remove_stale: Delete files of configs that are no longer part of ``instances``.
+    :return: SyncReport listing added, unchanged and stale files.
+    """
+    os.makedirs(destination_dir, exist_ok=True)
+    manifest = _read_manifest(destination_dir)
+    known = manifest["instances"]
+    next_id = manifest["next_id"]
+    # Files not tracked by the manifest (e.g. from save_to_directory) are never overwritten.
+    numbered = [key[1] for key in map(instance_sort_key, list_instance_files(destination_dir)) if key[0] == 0]
+    next_id = max([next_id, *(number + 1 for number in numbered)])
+
+    report = SyncReport()
+    current = {}
+    for instance in instances:
+        digest = config_hash(instance, cache=False)
+        if digest in current:
+            continue
+        number = known.get(digest)
+        filename = f"instance_{number}.json" if number is not None else None
+        if number is not None and os.path.exists(os.path.join(destination_dir, filename)):
+            report.unchanged.append(filename)
+        else:
+            if number is None:
+                number, next_id = next_id, next_id + 1
+                filename = f"instance_{number}.json"
+            atomic_write(os.path.join(destination_dir, filename), _dump_instance(instance, number, exclude_defaults, indent=4))
+            report.added.append(filename)
+        current[digest] = number
+
+    stale = {digest: number for digest, number in known.items() if digest not in current}
+    report.stale = [f"instance_{number}.json" for number in sorted(stale.values())]
+    if remove_stale:
+        for filename in report.stale:
+            path = os.path.join(destination_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
+        report.removed = True
+    else:
+        current.update(stale)
+
+    manifest = {"version": MANIFEST_VERSION, "next_id": next_id, "instances": current}
+    atomic_write(os.path.join(destination_dir, MANIFEST), json.dumps(manifest, indent=4))
+    print(f"Synced '{destination_dir}': {len(report.added)} added, {len(report.unchanged)} unchanged, "
+          f"{len(report.stale)} stale{' (removed)' if remove_stale and report.stale else ''}.")
+    return report
+
+
+def atomic_write(filepath: str, data: str) -> None:
+    """
+    Write ``data`` to a hidden temporary file next to ``filepath`` and rename it into place.
+    """
+    directory, filename = os.path.split(filepath)
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f".{filename}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)  # mkstemp creates the file readable only by the owner
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _read_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "next_id": 1, "instances": {}}
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import tempfile
+import pytest
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import load_from_directory
+from expergen.async_utils import (async_save_to_directory, async_load_from_directory, async_iter_from_directory,
+                                  async_save_to_stream, async_iter_from_stream)
+
+class AsyncConfig(BaseModel):
+    name: str = "base"
+    epochs: int = 10
+
+VARIATIONS = {"name": ["a", "b", "c"], "epochs": list(range(7))}
+
+def test_async_save_and_load_directory():
+    space = generate_variations(AsyncConfig(), VARIATIONS)
+
+    async def produce():
+        for instance in space:
+            await asyncio.sleep(0)
+            yield instance
+
+    async def main(tmpdir):
+        await async_save_to_directory(space, os.path.join(tmpdir, "sequence"), concurrency=3)
+        await async_save_to_directory(produce(), os.path.join(tmpdir, "stream"), concurrency=2)
+        loaded = await async_load_from_directory(os.path.join(tmpdir, "sequence"), AsyncConfig, concurrency=4)
+        shard = [c async for c in async_iter_from_directory(os.path.join(tmpdir, "stream"), AsyncConfig, num_shards=2, shard_index=1)]
+        return loaded, shard
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        loaded, shard = asyncio.run(main(tmpdir))
+        assert loaded == list(space)
+        assert shard == list(space)[11:]
+        assert load_from_directory(os.path.join(tmpdir, "stream"), AsyncConfig) == list(space)
+
+def test_async_save_propagates_errors():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            asyncio.run(async_save_to_directory([AsyncConfig()], tmpdir, naming="random"))
+        with pytest.raises(TypeError):
+            asyncio.run(async_save_to_directory([AsyncConfig(), object()], tmpdir))
+
+class MemoryStream:
+    def __init__(self):
+        self.data = b""
+        self.drains = 0
+
+    async def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+
+def test_async_stream_round_trip():
+    space = generate_variations(AsyncConfig(), VARIATIONS)
+
+    async def chunks(data):
+        for start in range(0, len(data), 7):
+            yield data[start:start + 7]
+
+    async def main():
+        stream = MemoryStream()
+        count = await async_save_to_stream(space, stream, concurrency=4)
+        from_chunks = [c async for c in async_iter_from_stream(chunks(stream.data), AsyncConfig)]
+        reader = asyncio.StreamReader()
+        reader.feed_data(stream.data)
+        reader.feed_eof()
+        from_reader = [c async for c in async_iter_from_stream(reader, AsyncConfig, concurrency=2)]
+        return count, stream, from_chunks, from_reader
+
+    count, stream, from_chunks, from_reader = asyncio.run(main())
+    assert count == stream.drains == len(space)
+    assert stream.data.count(b"\n") == len(space)
+    assert from_chunks == from_reader == list(space)
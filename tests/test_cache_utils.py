@@ -0,0 +1,68 @@
+import copy
+import threading
+import pytest
+from expergen.base_classes import ExpergenModel, ExpergenModelConfig
+from expergen.cache_utils import ModelCache
+
+class CachedNet(ExpergenModel):
+    built = 0
+
+    def __init__(self, config):
+        CachedNet.built += 1
+        self.config = config
+        self.weights = [0.0] * config.width
+
+    def forward(self):
+        return sum(self.weights)
+
+class CachedNetConfig(ExpergenModelConfig):
+    width: int = 4
+    activation: str = "relu"
+
+    def create_model(self):
+        return CachedNet(self)
+
+def test_model_cache_reuses_equal_configs():
+    CachedNet.built = 0
+    cache = ModelCache(maxsize=2)
+    first = CachedNetConfig().get_model(cache)
+    assert CachedNetConfig(width=4).get_model(cache) is first
+    assert CachedNetConfig(width=8).get_model(cache) is not first
+    assert CachedNet.built == 2
+    assert CachedNetConfig() in cache
+
+    CachedNetConfig(activation="tanh").get_model(cache)  # evicts the least recently used width=4 model
+    assert CachedNetConfig() not in cache
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 3, 1, 2)
+
+    assert CachedNetConfig().get_model() is not CachedNetConfig().get_model()
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 2, 0, 0)
+
+def test_model_cache_clone_and_weight():
+    cache = ModelCache(maxsize=None, clone=copy.deepcopy, weigher=lambda model: len(model.weights), max_weight=10)
+    built = CachedNetConfig().get_model(cache)
+    hit = CachedNetConfig().get_model(cache)
+    assert hit is not built and hit.weights == built.weights
+    built.weights[0] = hit.weights[1] = 1.0
+    assert cache.get(CachedNetConfig()).weights == [0.0] * 4
+
+    cache.get(CachedNetConfig(width=6))
+    assert cache.info().weight == 10
+    cache.get(CachedNetConfig(width=5))
+    assert len(cache) == 1 and cache.info().evictions == 2
+
+    with pytest.raises(ValueError):
+        ModelCache(maxsize=-1)
+
+def test_model_cache_is_thread_safe():
+    cache = ModelCache(maxsize=3)
+    configs = [CachedNetConfig(width=w % 5 + 1) for w in range(200)]
+    threads = [threading.Thread(target=lambda part=configs[i::4]: [cache.get(c) for c in part]) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.info()
+    assert info.hits + info.misses == 200 and info.currsize == 3
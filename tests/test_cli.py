@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import pytest
+from pydantic import BaseModel
+from expergen.cli import main, import_object
+from expergen.json_utils import load_from_directory
+from expergen.store_utils import open_store
+
+class CliTraining(BaseModel):
+    epochs: int = 10
+    learning_rate: float = 0.1
+
+class CliConfig(BaseModel):
+    activation: str = "relu"
+    training: CliTraining = CliTraining()
+
+def double(value):
+    return value * 2
+
+def write_spec(directory, spec, name="sweep.json"):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        json.dump(spec, f)
+    return path
+
+SPEC = {
+    "model": f"{__name__}:CliConfig",
+    "base": {"training": {"learning_rate": 0.5}},
+    "variations": {"activation": ["relu", "tanh"], "training.epochs": [1, 2, 3]},
+    "transformations": {"training.epochs": f"{__name__}:double"},
+}
+
+def test_cli_expands_to_directory_and_store(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec = write_spec(tmpdir, SPEC)
+        assert main([spec, "-o", os.path.join(tmpdir, "out")]) == 0
+        configs = load_from_directory(os.path.join(tmpdir, "out"), CliConfig)
+        assert [(c.activation, c.training.epochs) for c in configs] == [(a, e * 2) for a in ["relu", "tanh"] for e in [1, 2, 3]]
+        assert all(c.training.learning_rate == 0.5 for c in configs)
+
+        assert main([spec, "--store", "-o", os.path.join(tmpdir, "store"), "--num-shards", "2", "--shard-index", "1"]) == 0
+        with open_store(os.path.join(tmpdir, "store"), CliConfig) as store:
+            assert list(store) == configs[3:]
+
+        capsys.readouterr()
+        assert main([spec, "--count", "--num-shards", "4", "--shard-index", "0", "--shard-strategy", "strided"]) == 0
+        assert capsys.readouterr().out.strip() == "2"
+
+def test_cli_sampling_and_errors(capsys):
+    spec = dict(SPEC, variations={"activation": ["relu", "tanh"], "training.learning_rate": {"uniform": [0.001, 0.1], "log": True}},
+                sample={"n": 7, "method": "lhs", "seed": 0})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert main([write_spec(tmpdir, spec), "-o", os.path.join(tmpdir, "out")]) == 0
+        configs = load_from_directory(os.path.join(tmpdir, "out"), CliConfig)
+        assert len(configs) == 7
+        assert all(0.001 <= c.training.learning_rate <= 0.1 for c in configs)
+
+        with pytest.raises(SystemExit):
+            main([write_spec(tmpdir, dict(SPEC, unknown=1)), "-o", tmpdir])
+        with pytest.raises(SystemExit):
+            main([write_spec(tmpdir, dict(SPEC, model=None)), "--count"])
+        assert "No config class" in capsys.readouterr().err
+        with pytest.raises(SystemExit) as exit_info:
+            main([write_spec(tmpdir, dict(SPEC, variations={"activation": {"normal": 1}})), "--count"])
+        assert exit_info.value.code == 2
+        assert "Unsupported distribution {'normal': 1} for 'activation'" in capsys.readouterr().err
+
+        with pytest.raises(SystemExit):
+            main([write_spec(tmpdir, SPEC), "-o", os.path.join(tmpdir, "bad"), "--format", "yaml"])
+        assert "invalid choice: 'yaml'" in capsys.readouterr().err
+        assert not os.path.exists(os.path.join(tmpdir, "bad"))
+        for option in (["--format", "gzip"], ["--naming", "hash"], ["--workers", "2"]):
+            with pytest.raises(SystemExit):
+                main([write_spec(tmpdir, SPEC), "--store", "-o", os.path.join(tmpdir, "store"), *option])
+            assert "not allowed with" in capsys.readouterr().err
+
+def test_import_object():
+    assert import_object("os.path:join") is os.path.join
+    assert import_object("os.path.join") is os.path.join
+    with pytest.raises(ImportError):
+        import_object("join")
+
+def test_import_is_lazy():
+    code = "import sys, expergen; assert 'pydantic' not in sys.modules and 'numpy' not in sys.modules; expergen.VariationSpace; assert 'numpy' in sys.modules"
+    code += "; assert expergen.json_utils.load_from_json is expergen.load_from_json; assert not hasattr(expergen, 'missing')"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -60,3 +60,170 @@ def test_generate_variations_type_checking():
     
     with pytest.raises(TypeError):
         generate_variations(instance, variations)
+
+def test_variation_space_is_lazy_and_indexable():
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+
+    variations = {
+        "field1": list(range(100)),
+        "nested.value": list(range(100)),
+        "field2": [str(i) for i in range(100)],
+    }
+
+    space = generate_variations(instance, variations)
+
+    assert len(space) == 1_000_000
+    assert space[0].field1 == 0 and space[0].nested.value == 0 and space[0].field2 == "0"
+    assert (space[123_456].field1, space[123_456].nested.value, space[123_456].field2) == (12, 34, "56")
+    assert space[-1].field1 == 99 and space[-1].field2 == "99"
+    assert instance.field1 == 1  # base instance is never modified
+
+    sliced = space[10:20:3]
+    assert len(sliced) == 4
+    assert [r.field2 for r in sliced] == ["10", "13", "16", "19"]
+    assert sliced[1].field2 == "13"
+
+def test_variation_space_matches_product_order():
+    from itertools import product
+
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+    variations = {"field1": [1, 2, 3], "nested.value": (v for v in [10, 20])}
+
+    results = generate_variations(instance, variations)
+
+    assert [(r.field1, r.nested.value) for r in results] == list(product([1, 2, 3], [10, 20]))
+    with pytest.raises(IndexError):
+        results[6]
+
+def test_compiled_field_paths_are_cached():
+    from expergen.dataclass_utils import compile_field_path
+
+    field = compile_field_path("nested.value")
+    assert compile_field_path("nested.value") is field
+    assert field.parts == ("nested", "value")
+
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+    assert field.get(instance) == 10
+    field.set(instance, 11)
+    assert instance.nested.value == 11
+    assert field.expected_type(instance) is int
+
+def test_generate_variations_unknown_field():
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+
+    with pytest.raises(ValueError):
+        generate_variations(instance, {"nested.missing": [1, 2]})
+
+def test_generate_variations_nested_under_varied_field():
+    @dataclass
+    class OtherNested:
+        label: str
+
+    @dataclass
+    class Holder:
+        nested: object
+
+    instance = Holder(nested=NestedClass(value=10))
+    variations = {"nested": [OtherNested(label="a")], "nested.label": ["b", "c"]}
+
+    results = generate_variations(instance, variations)
+
+    assert [r.nested.label for r in results] == ["b", "c"]
+    with pytest.raises(TypeError):
+        generate_variations(instance, {"nested": [OtherNested(label="a")], "nested.label": [1]})[0]
+
+def test_generate_variations_shares_untouched_subtrees():
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+
+    results = generate_variations(instance, {"field1": [1, 2], "nested.value": [20]})
+
+    for r in results:
+        assert r is not instance
+        assert r.list_field is instance.list_field
+        assert r.nested is not instance.nested
+    assert results[0].nested is not results[1].nested
+    assert instance.nested.value == 10
+
+def test_generate_variations_deep_copy():
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+
+    results = generate_variations(instance, {"field1": [1, 2]}, deep_copy=True)
+
+    assert results[0].list_field == instance.list_field
+    assert results[0].list_field is not instance.list_field
+    assert results[0].nested is not instance.nested
+
+def test_generate_variations_with_constraints():
+    from itertools import product
+
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+    variations = {
+        "field1": list(range(10)),
+        "field2": ["a", "b", "c"],
+        "nested.value": list(range(20)),
+    }
+    constraints = {
+        ("field1", "nested.value"): lambda f1, value: f1 * value <= 30,
+        "field2": lambda f2: f2 != "b",
+    }
+
+    results = generate_variations(instance, variations, constraints=constraints)
+
+    expected = [c for c in product(*variations.values()) if c[0] * c[2] <= 30 and c[1] != "b"]
+    assert len(results) == len(expected)
+    assert [(r.field1, r.field2, r.nested.value) for r in results] == expected
+    assert [(r.field1, r.field2, r.nested.value) for r in results[5:40]] == expected[5:40]
+    assert [(r.field1, r.field2, r.nested.value) for r in results[::7]] == expected[::7]
+    assert (results[-1].field1, results[-1].field2, results[-1].nested.value) == expected[-1]
+
+def test_constraints_prune_before_building():
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+    calls = []
+
+    def only_small(value):
+        calls.append(value)
+        return value < 2
+
+    variations = {"field1": list(range(1000)), "nested.value": list(range(1000)), "field2": ["a", "b"]}
+    results = generate_variations(instance, variations, constraints={"field1": only_small})
+
+    assert len(results) == 2 * 1000 * 2
+    assert len(calls) == 1000
+
+    with pytest.raises(ValueError):
+        generate_variations(instance, variations, constraints={"list_field": lambda x: True})
+
+def test_generate_variations_with_batch_transformations():
+    import numpy as np
+
+    instance = TestClass(field1=1, field2="test", nested=NestedClass(value=10), list_field=[1, 2, 3])
+    variations = {"field1": [1, 2, 3], "field2": ["a", "b"], "nested.value": [10, 20]}
+    calls = []
+
+    def scale(value, field1):
+        calls.append(len(value))
+        return value * field1 + 1
+
+    batch_transformations = {
+        "nested.value": (scale, ["field1"]),
+        "field2": np.char.upper,
+    }
+    results = generate_variations(instance, variations, {"nested.value": lambda x: -x}, batch_transformations=batch_transformations)
+
+    assert calls == [6]  # one call over the 3 x 2 distinct (nested.value, field1) pairs
+    assert [(r.field1, r.field2, r.nested.value) for r in results] == [
+        (f1, f2.upper(), -(value * f1 + 1)) for f1 in [1, 2, 3] for f2 in ["a", "b"] for value in [10, 20]
+    ]
+    assert results[7].nested.value == -(20 * 2 + 1)
+    assert all(isinstance(r.nested.value, int) for r in results)
+
+    # a field that is not varied and has no dependencies is transformed once
+    results = generate_variations(instance, {"field2": ["a", "b"]}, batch_transformations={"nested.value": lambda value: value * 2})
+    assert [(r.field2, r.nested.value) for r in results] == [("a", 20), ("b", 20)]
+
+    with pytest.raises(TypeError):
+        generate_variations(instance, variations, batch_transformations={"field1": lambda x: x / 2})
+    with pytest.raises(ValueError):
+        generate_variations(instance, variations, batch_transformations={"field1": lambda x: x[:1]})
+    with pytest.raises(ValueError):
+        generate_variations(instance, variations, batch_transformations={"field1": (lambda x, y: x, ["list_field"])})
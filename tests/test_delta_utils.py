@@ -0,0 +1,67 @@
+import pytest
+import os
+import json
+import tempfile
+from typing import List, Union
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.delta_utils import save_deltas, open_deltas, load_deltas, diff, apply_delta
+
+class OptimizerConfig(BaseModel):
+    name: str = "SGD"
+    momentum: float = 0.9
+
+class AdamConfig(BaseModel):
+    name: str = "Adam"
+    betas: List[float] = [0.9, 0.999]
+
+class TrainConfig(BaseModel):
+    num_epochs: int = 100
+    optimizer: Union[OptimizerConfig, AdamConfig] = OptimizerConfig()
+    vocabulary: List[str] = [f"token{i}" for i in range(1000)]
+
+class DeltaConfig(BaseModel):
+    dropout_rate: float = 0.3
+    training: TrainConfig = TrainConfig()
+
+def test_diff_and_apply_delta():
+    base = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e": {"f": 1}}
+    other = {"a": 2, "b": {"c": [1, 3], "d": "x"}, "e": {"g": 1}}
+
+    delta = diff(base, other)
+
+    assert delta == {"a": 2, "b.c": [1, 3], "e": {"g": 1}}
+    assert apply_delta(base, delta) == other
+    assert base["b"]["c"] == [1, 2]
+    assert diff(base, base) == {}
+
+def test_save_deltas_from_variation_space():
+    space = generate_variations(DeltaConfig(), {
+        "training.num_epochs": [50, 100],
+        "training.optimizer": [OptimizerConfig(), AdamConfig()],
+    }, {"dropout_rate": lambda x: x * 2})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert save_deltas(space, tmpdir) == 4
+
+        with open_deltas(tmpdir, DeltaConfig) as store:
+            assert len(store) == 4
+            assert store.read_bytes(0) == b'{"training.num_epochs":50,"dropout_rate":0.6}'
+            assert store[3] == space[3]
+            assert list(store) == list(space)
+
+def test_save_deltas_with_explicit_base():
+    base = DeltaConfig()
+    instances = [DeltaConfig(dropout_rate=0.1), DeltaConfig(training=TrainConfig(vocabulary=["a"]))]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_deltas(instances, tmpdir, base=base)
+
+        assert load_deltas(tmpdir, DeltaConfig) == instances
+        with open(os.path.join(tmpdir, "base.json")) as f:
+            assert DeltaConfig.model_validate(json.load(f)) == base
+
+def test_save_deltas_requires_base():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            save_deltas([DeltaConfig()], tmpdir)
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import pytest
+from typing import List, Union
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import load_from_directory, load_from_json, save_to_directory
+from expergen.format_utils import FORMATS, SerializationFormat, detect_format, get_format, register_format
+
+class FormatConfig(BaseModel):
+    name: str = "base"
+    choice: Union[int, str] = 0
+    weights: List[float] = [0.5] * 100
+
+VARIATIONS = {"name": ["a", "b"], "choice": [1, "two", 3], "weights": [[0.25] * 200, [1.0, 2.0]]}
+
+@pytest.mark.parametrize("format", ["json", "compact", "gzip", "zstd", "msgpack"])
+def test_formats_round_trip(format):
+    if format == "zstd":
+        pytest.importorskip("zstandard")
+    if format == "msgpack":
+        pytest.importorskip("msgpack")
+    space = generate_variations(FormatConfig(), VARIATIONS)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(space, tmpdir, format=format, workers=2 if format == "gzip" else None)
+        extension = get_format(format).extension
+        assert sorted(os.listdir(tmpdir)) == sorted(f"instance_{i}{extension}" for i in range(1, len(space) + 1))
+        assert load_from_directory(tmpdir, FormatConfig) == list(space)
+        path = os.path.join(tmpdir, f"instance_1{extension}")
+        assert load_from_json(path, FormatConfig) == space[0]
+        assert load_from_json(path, FormatConfig, format=format) == space[0]
+
+def test_compact_and_compressed_are_smaller():
+    space = generate_variations(FormatConfig(), VARIATIONS)
+    sizes = {}
+    for format in ["json", "compact", "gzip"]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_to_directory(space, tmpdir, format=format, exclude_defaults=False)
+            sizes[format] = sum(os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir))
+    assert sizes["gzip"] < sizes["compact"] < sizes["json"]
+
+def test_detect_format():
+    assert detect_format("instance_1.json").name == "json"
+    assert detect_format("instance_1.json.gz").name == "gzip"
+    assert detect_format("instance_1.json", b"\x1f\x8b\x08").name == "gzip"  # renamed compressed file
+    assert detect_format("config.msgpack").name == "msgpack"
+    with pytest.raises(ValueError):
+        get_format("xml")
+
+def test_register_custom_format():
+    class ReversedJson(SerializationFormat):
+        name = "reversed"
+        extension = ".nosj"
+
+        def dumps(self, instance, index, exclude_defaults):
+            return super().dumps(instance, index, exclude_defaults)[::-1]
+
+        def loads(self, data, model_type):
+            return super().loads(data[::-1], model_type)
+
+    register_format(ReversedJson())
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_to_directory([FormatConfig(name="custom")], tmpdir, format="reversed")
+            assert os.listdir(tmpdir) == ["instance_1.nosj"]
+            assert load_from_directory(tmpdir, FormatConfig) == [FormatConfig(name="custom")]
+    finally:
+        del FORMATS["reversed"]
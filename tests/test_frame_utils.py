@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+from typing import List
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.frame_utils import ConfigFrame
+
+class ModelConfig(BaseModel):
+    activation: str = "relu"
+    layers: List[int] = [8]
+
+class TrainingConfig(BaseModel):
+    num_epochs: int = 100
+    learning_rate: float = 0.001
+
+class FrameConfig(BaseModel):
+    model: ModelConfig = ModelConfig()
+    training: TrainingConfig = TrainingConfig()
+
+VARIATIONS = {
+    "model.activation": ["relu", "tanh", "gelu"],
+    "model.layers": [[8], [16, 16]],
+    "training.num_epochs": [10, 100, 1000],
+    "training.learning_rate": [0.1, 0.01],
+}
+
+def test_columns_match_space():
+    space = generate_variations(FrameConfig(), VARIATIONS)
+    frame = ConfigFrame(space)
+
+    assert len(frame) == 36
+    assert frame["model.activation"].tolist() == [c.model.activation for c in space]
+    assert frame["training.num_epochs"].tolist() == [c.training.num_epochs for c in space]
+    assert frame["model.layers"].tolist() == [c.model.layers for c in space]
+    assert frame.codes("training.learning_rate").dtype == np.uint8
+    with pytest.raises(KeyError):
+        frame.codes("training.missing")
+
+def test_filter_and_convert_selected_rows():
+    frame = ConfigFrame.from_variations(FrameConfig(), VARIATIONS)
+
+    selected = frame[(frame["model.activation"] == "relu") & (frame["training.num_epochs"] >= 100)]
+
+    assert len(selected) == 8
+    models = selected.to_models()
+    assert all(m.model.activation == "relu" and m.training.num_epochs >= 100 for m in models)
+    assert len(selected[selected.isin("model.layers", [[16, 16]])]) == 4
+    assert selected[:3].rows.tolist() == selected.rows[:3].tolist()
+
+def test_groupby():
+    frame = ConfigFrame.from_variations(FrameConfig(), VARIATIONS)
+
+    groups = frame.groupby("model.activation")
+    assert list(groups) == ["relu", "tanh", "gelu"]
+    assert all(len(group) == 12 for group in groups.values())
+    assert set(groups["tanh"]["model.activation"]) == {"tanh"}
+
+    groups = frame[frame["training.learning_rate"] == 0.1].groupby("model.activation", "training.num_epochs")
+    assert len(groups) == 9
+    assert all(m.training.num_epochs == 1000 for m in groups[("gelu", 1000)].instances())
+
+    groups = frame.groupby("model.layers")
+    assert list(groups) == [(8,), (16, 16)]
+    assert all(m.model.layers == [16, 16] for m in groups[(16, 16)].instances())
+    assert list(frame.groupby("model.layers", "model.activation"))[0] == ((8,), "relu")
+
+def test_constrained_space():
+    constraints = {("model.activation", "training.num_epochs"): lambda a, e: a != "tanh" or e < 100}
+    space = generate_variations(FrameConfig(), VARIATIONS, constraints=constraints)
+    frame = ConfigFrame(space)
+
+    assert len(frame) == len(space) == 28
+    assert frame["training.num_epochs"].tolist() == [c.training.num_epochs for c in space]
+    assert frame[frame["model.activation"] == "tanh"].to_models() == [c for c in space if c.model.activation == "tanh"]
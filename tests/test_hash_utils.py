@@ -0,0 +1,92 @@
+import pytest
+import os
+import tempfile
+from dataclasses import dataclass
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.hash_utils import config_hash, iter_unique
+from expergen.json_utils import save_to_directory
+
+class InnerConfig(BaseModel):
+    rate: float = 0.5
+    name: str = "inner"
+
+class HashedConfig(BaseModel):
+    inner: InnerConfig = InnerConfig()
+    epochs: int = 10
+
+class ReorderedConfig(BaseModel):
+    epochs: int = 10
+    inner: InnerConfig = InnerConfig()
+
+def test_config_hash_is_canonical():
+    assert config_hash(HashedConfig()) == config_hash(HashedConfig(), cache=False)
+    assert config_hash(HashedConfig()) == config_hash(ReorderedConfig())
+    assert config_hash(HashedConfig(inner=InnerConfig(rate=1))) == config_hash(HashedConfig(inner=InnerConfig(rate=1.0)))
+    assert config_hash(HashedConfig()) != config_hash(HashedConfig(epochs=11))
+
+    @dataclass
+    class PlainConfig:
+        epochs: int = 10
+
+    assert config_hash(PlainConfig()) == config_hash(PlainConfig(epochs=10))
+
+def test_config_hash_follows_in_place_edits():
+    config = HashedConfig()
+    digest = config_hash(config, cache=True)
+    config.inner.rate = 5.0
+    assert config_hash(config) != digest
+    assert config_hash(config, cache=True) == config_hash(config)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory([config], tmpdir, naming="hash")
+        config.inner.rate = 6.0
+        save_to_directory([config], tmpdir, naming="hash")
+        assert sorted(os.listdir(tmpdir)) == sorted([f"{digest}.json" for digest in {config_hash(config), config_hash(HashedConfig(inner=InnerConfig(rate=5.0)))}])
+
+def test_config_hash_caches_only_frozen_instances():
+    from expergen import hash_utils
+
+    class FrozenInner(BaseModel, frozen=True):
+        rate: float = 0.5
+
+    class FrozenConfig(BaseModel, frozen=True):
+        inner: FrozenInner = FrozenInner()
+        layers: tuple = (1, 2)
+
+    class MixedConfig(BaseModel, frozen=True):
+        inner: InnerConfig = InnerConfig()
+
+    frozen, mixed = FrozenConfig(), MixedConfig()
+    config_hash(frozen, cache=True)
+    config_hash(mixed, cache=True)
+    assert id(frozen) in hash_utils._hash_cache
+    assert id(mixed) not in hash_utils._hash_cache  # the nested model is still mutable
+
+def test_unique_variations():
+    space = generate_variations(HashedConfig(), {"epochs": [1, 5, 10, 50, 100]}, {"epochs": lambda x: min(x, 10)})
+
+    assert [c.epochs for c in space.unique()] == [1, 5, 10]
+    assert [c.epochs for c in iter_unique(list(space))] == [1, 5, 10]
+
+def test_save_to_directory_named_by_hash():
+    space = generate_variations(HashedConfig(), {"epochs": [1, 5, 10, 50]}, {"epochs": lambda x: min(x, 10)})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(space, tmpdir, naming="hash")
+        assert sorted(os.listdir(tmpdir)) == sorted(f"{config_hash(c)}.json" for c in space.unique())
+
+        for filename in os.listdir(tmpdir):
+            os.utime(os.path.join(tmpdir, filename), (0, 0))
+        save_to_directory(space, tmpdir, naming="hash", workers=2)
+        assert all(os.path.getmtime(os.path.join(tmpdir, f)) == 0 for f in os.listdir(tmpdir))
+
+        with pytest.raises(ValueError):
+            save_to_directory(space, tmpdir, naming="uuid")
+
+def test_save_unique_iterator_to_directory():
+    space = generate_variations(HashedConfig(), {"epochs": [1, 5, 10, 50]}, {"epochs": lambda x: min(x, 10)})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(space.unique(), tmpdir)
+        assert sorted(os.listdir(tmpdir)) == ["instance_1.json", "instance_2.json", "instance_3.json"]
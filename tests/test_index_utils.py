@@ -0,0 +1,47 @@
+import pytest
+import tempfile
+from typing import List
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import save_to_directory
+from expergen.index_utils import query_directory
+
+class ModelConfig(BaseModel):
+    activation: str = "relu"
+    layers: List[int] = [8]
+
+class TrainingConfig(BaseModel):
+    num_epochs: int = 100
+
+class IndexedConfig(BaseModel):
+    model: ModelConfig = ModelConfig()
+    training: TrainingConfig = TrainingConfig()
+
+VARIATIONS = {
+    "model.activation": ["relu", "tanh"],
+    "model.layers": [[8], [16, 16]],
+    "training.num_epochs": [10, 100, 1000],
+}
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_query_directory(workers):
+    space = generate_variations(IndexedConfig(), VARIATIONS)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(space, tmpdir, index=True, workers=workers, chunk_size=5)
+
+        result = query_directory(tmpdir, IndexedConfig, model__activation="relu", training__num_epochs__ge=100)
+        assert result == [c for c in space if c.model.activation == "relu" and c.training.num_epochs >= 100]
+
+        assert query_directory(tmpdir, IndexedConfig, **{"model.layers": [16, 16], "training.num_epochs__in": [10, 1000]}) == \
+            [c for c in space if c.model.layers == [16, 16] and c.training.num_epochs in (10, 1000)]
+        assert query_directory(tmpdir, IndexedConfig, model__activation="gelu") == []
+        assert query_directory(tmpdir, IndexedConfig) == list(space)
+        with pytest.raises(KeyError):
+            query_directory(tmpdir, IndexedConfig, model__missing=1)
+
+def test_query_directory_without_index():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory([IndexedConfig()], tmpdir)
+        with pytest.raises(FileNotFoundError):
+            query_directory(tmpdir, IndexedConfig, model__activation="relu")
@@ -243,3 +243,60 @@ def test_right_forward_from_right_model():
         assert isinstance(loaded_model_b, ModelWithConfig)
         assert isinstance(loaded_model_b.config, ConfigB)
         assert loaded_model_b.forward() == "Config B: Hello"
+
+def test_save_to_directory_parallel_matches_serial():
+    from expergen.json_utils import generate_and_save
+    from expergen.dataclass_utils import generate_variations
+
+    base = PydanticModel(field1=0, field2="base")
+    variations = {"field1": list(range(10)), "field2": ["a", "b", "c"]}
+    transformations = {"field2": lambda x: x.upper()}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial_dir = os.path.join(tmpdir, "serial")
+        parallel_dir = os.path.join(tmpdir, "parallel")
+        save_to_directory(generate_variations(base, variations, transformations), serial_dir)
+        generate_and_save(base, variations, parallel_dir, transformations, workers=3, chunk_size=4)
+
+        assert sorted(os.listdir(serial_dir)) == sorted(os.listdir(parallel_dir))
+        assert len(os.listdir(parallel_dir)) == 30
+        for filename in os.listdir(serial_dir):
+            with open(os.path.join(serial_dir, filename), "rb") as f1, open(os.path.join(parallel_dir, filename), "rb") as f2:
+                assert f1.read() == f2.read()
+
+def test_iter_from_directory_orders_by_instance_number():
+    from expergen.json_utils import iter_from_directory
+
+    instances = [PydanticModel(field1=i, field2=f"test{i}") for i in range(25)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(instances, tmpdir)
+        with open(os.path.join(tmpdir, ".hidden.json"), "w") as f:
+            f.write("not json")
+
+        assert load_from_directory(tmpdir, PydanticModel) == instances
+        assert list(iter_from_directory(tmpdir, PydanticModel, workers=4, read_ahead=3)) == instances
+        assert list(iter_from_directory(tmpdir, PydanticModel, pattern="instance_1?.json", workers=2)) == instances[9:19]
+
+def test_load_from_json_dataclasses_and_mmap():
+    from pydantic.dataclasses import dataclass as pydantic_dataclass
+
+    @dataclass
+    class PlainConfig:
+        field1: int
+        field2: str
+
+    @pydantic_dataclass
+    class ValidatedConfig:
+        field1: int
+        field2: str
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, "test.json")
+        with open(filepath, "w") as f:
+            f.write('{"field1": "1", "field2": "test"}')
+
+        plain = load_from_json(filepath, PlainConfig)
+        assert (plain.field1, plain.field2) == (1, "test")
+        assert load_from_json(filepath, ValidatedConfig) == ValidatedConfig(field1=1, field2="test")
+        assert load_from_json(filepath, PydanticModel, use_mmap=True) == PydanticModel(field1=1, field2="test")
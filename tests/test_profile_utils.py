@@ -0,0 +1,51 @@
+import os
+import tempfile
+import pytest
+from typing import List
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import save_to_directory
+from expergen.profile_utils import Profiler
+
+class ProfiledConfig(BaseModel):
+    name: str = "base"
+    epochs: int = 10
+    layers: List[int] = [8]
+
+VARIATIONS = {"name": ["a", "b", "c", "d"], "epochs": [1, 2, 3, 4, 5]}
+
+def test_profiler_records_generation_stages():
+    profiler = Profiler()
+    space = generate_variations(ProfiledConfig(), VARIATIONS, {"epochs": lambda x: x * 10, "layers": lambda x: x + [4]}, profiler=profiler)
+
+    assert [c.epochs for c in space] == [e * 10 for _ in VARIATIONS["name"] for e in VARIATIONS["epochs"]]
+    assert profiler.counters["built"] == 20
+    assert profiler.calls["build"] == profiler.calls["copy"] == 20
+    assert profiler.calls["transform:epochs"] == profiler.calls["transform:layers"] == 20
+    assert profiler.calls["type_check"] == 40
+    report = profiler.report()
+    assert report["instances"] == 20
+    assert {name for name, _ in report["slowest_transforms"]} == {"epochs", "layers"}
+    assert "20 instances" in profiler.summary()
+
+    with pytest.raises(ValueError):
+        Profiler(every=0)
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_profiler_records_saving(workers):
+    progress = []
+    profiler = Profiler(callbacks=[lambda done, total, _: progress.append((done, total))], every=8)
+    space = generate_variations(ProfiledConfig(), VARIATIONS, profiler=profiler)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(space, tmpdir, workers=workers, chunk_size=5, profiler=profiler)
+        size = sum(os.path.getsize(os.path.join(tmpdir, f)) for f in os.listdir(tmpdir))
+
+    assert profiler.counters["instances"] == profiler.counters["files_written"] == 20
+    assert profiler.counters["built"] == 20
+    assert profiler.counters["bytes_written"] == size
+    assert profiler.calls["serialize"] == profiler.calls["write"] == 20
+    assert profiler.calls["save_to_directory"] == 1
+    assert progress[-1] == (20, 20)
+    assert all(done - previous >= 8 for (previous, _), (done, _) in zip([(0, 0)] + progress[:-2], progress[:-1]))
+    assert "MiB written" in profiler.summary()
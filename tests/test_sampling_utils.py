@@ -0,0 +1,58 @@
+import pytest
+from collections import Counter
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.sampling_utils import sample_variations, Uniform, latin_hypercube
+
+class TrainingConfig(BaseModel):
+    learning_rate: float = 0.001
+    num_layers: int = 2
+    activation: str = "relu"
+
+class SampledConfig(BaseModel):
+    training: TrainingConfig = TrainingConfig()
+    seed: int = 0
+
+HUGE = {
+    "training.num_layers": list(range(10_000)),
+    "training.activation": [f"act{i}" for i in range(10_000)],
+    "seed": list(range(10_000)),
+}
+
+def test_random_sampling_without_replacement():
+    samples = sample_variations(SampledConfig(), HUGE, 500, seed=0)
+
+    assert len(samples) == 500
+    assert len({s.model_dump_json() for s in samples}) == 500
+    assert sample_variations(SampledConfig(), HUGE, 500, seed=0) == samples
+
+    small = {"seed": [1, 2, 3]}
+    assert sorted(s.seed for s in sample_variations(SampledConfig(), small, 3, seed=1)) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        sample_variations(SampledConfig(), small, 4)
+
+def test_latin_hypercube_covers_discrete_values_evenly():
+    variations = {"training.num_layers": [1, 2, 3, 4], "training.learning_rate": Uniform(1e-4, 1e-1, log=True)}
+
+    samples = sample_variations(SampledConfig(), variations, 8, method="lhs", seed=3)
+
+    assert Counter(s.training.num_layers for s in samples) == {1: 2, 2: 2, 3: 2, 4: 2}
+    rates = sorted(s.training.learning_rate for s in samples)
+    assert all(1e-4 <= r < 1e-1 for r in rates)
+    for stratum, point in enumerate(sorted(p[0] for p in latin_hypercube(8, 1, seed=0))):
+        assert stratum / 8 <= point < (stratum + 1) / 8
+
+def test_sobol_sampling():
+    pytest.importorskip("scipy")
+    variations = {"training.learning_rate": Uniform(0.0, 1.0), "seed": list(range(4))}
+
+    samples = sample_variations(SampledConfig(), variations, 16, method="sobol", seed=0)
+
+    assert Counter(s.seed for s in samples) == {0: 4, 1: 4, 2: 4, 3: 4}
+    assert all(0.0 <= s.training.learning_rate < 1.0 for s in samples)
+
+def test_continuous_axes_cannot_be_enumerated():
+    with pytest.raises(TypeError):
+        generate_variations(SampledConfig(), {"training.learning_rate": Uniform(0.0, 1.0)})
+    with pytest.raises(TypeError):
+        sample_variations(SampledConfig(), {"training.activation": Uniform(0.0, 1.0)}, 1)
@@ -0,0 +1,79 @@
+import pytest
+import tempfile
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import save_to_directory, load_from_directory
+from expergen.shard_utils import shard_range, balanced_shard_range, shard_from_env
+from expergen.store_utils import save_to_store, open_store
+
+class ShardedConfig(BaseModel):
+    num_layers: int = 1
+    hidden: int = 8
+
+VARIATIONS = {"num_layers": [1, 2, 3, 4, 5], "hidden": [8, 16, 32]}
+
+def test_shard_range():
+    assert [shard_range(10, i, 3) for i in range(3)] == [range(0, 4), range(4, 7), range(7, 10)]
+    assert list(shard_range(10, 1, 3, "strided")) == [1, 4, 7]
+    assert [len(shard_range(2, i, 4)) for i in range(4)] == [1, 1, 0, 0]
+    with pytest.raises(ValueError):
+        shard_range(10, 3, 3)
+    with pytest.raises(ValueError):
+        shard_range(10, 0, 3, "random")
+
+def test_balanced_shard_range():
+    costs = [2, 2, 2, 2] + [1] * 12
+    shards = [balanced_shard_range(costs, i, 2) for i in range(2)]
+    assert shards == [range(0, 6), range(6, 16)]
+    assert balanced_shard_range([], 0, 2) == range(0)
+
+def test_shard_from_env(monkeypatch):
+    for index_variable, count_variable in [("EXPERGEN_SHARD_INDEX", "EXPERGEN_NUM_SHARDS"), ("RANK", "WORLD_SIZE")]:
+        monkeypatch.delenv(index_variable, raising=False)
+        monkeypatch.delenv(count_variable, raising=False)
+    monkeypatch.setenv("SLURM_ARRAY_TASK_ID", "3")
+    monkeypatch.setenv("SLURM_ARRAY_TASK_MIN", "1")
+    monkeypatch.setenv("SLURM_ARRAY_TASK_COUNT", "4")
+    assert shard_from_env() == (2, 4)
+
+    monkeypatch.setenv("EXPERGEN_SHARD_INDEX", "0")
+    monkeypatch.setenv("EXPERGEN_NUM_SHARDS", "2")
+    assert shard_from_env() == (0, 2)
+    assert [c.num_layers for c in generate_variations(ShardedConfig(), {"num_layers": [1, 2, 3]}, num_shards=2)] == [1, 2]
+
+def test_num_shards_without_shard_variable(monkeypatch):
+    from expergen.shard_utils import SHARD_ENVIRONMENT
+    for variables in SHARD_ENVIRONMENT:
+        for variable in variables:
+            monkeypatch.delenv(variable, raising=False)
+    assert shard_range(10) == range(10)
+    with pytest.raises(ValueError, match="no shard variable"):
+        shard_range(10, num_shards=4)
+    with pytest.raises(ValueError):
+        generate_variations(ShardedConfig(), VARIATIONS, num_shards=2)
+
+def test_shards_partition_the_space():
+    space = generate_variations(ShardedConfig(), VARIATIONS)
+
+    for strategy in ("contiguous", "strided"):
+        shards = [list(generate_variations(ShardedConfig(), VARIATIONS, shard_index=i, num_shards=4, shard_strategy=strategy)) for i in range(4)]
+        assert sorted((c for shard in shards for c in shard), key=lambda c: (c.num_layers, c.hidden)) == list(space)
+
+    cost = lambda values: values["num_layers"] * values["hidden"]
+    shards = [space.shard(i, 3, strategy="balanced", cost=cost) for i in range(3)]
+    assert [c for shard in shards for c in shard] == list(space)
+    totals = [sum(c.num_layers * c.hidden for c in shard) for shard in shards]
+    assert max(totals) - min(totals) <= 5 * 32
+
+def test_shard_loaders():
+    instances = list(generate_variations(ShardedConfig(), VARIATIONS))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory(instances, tmpdir)
+        assert load_from_directory(tmpdir, ShardedConfig, shard_index=1, num_shards=2) == instances[8:]
+        assert load_from_directory(tmpdir, ShardedConfig, shard_index=0, num_shards=4, shard_strategy="strided") == instances[::4]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_store(instances, tmpdir, shard_size=4)
+        with open_store(tmpdir, ShardedConfig) as store:
+            assert list(store.shard(2, 3)) == instances[10:]
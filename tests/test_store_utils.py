@@ -0,0 +1,70 @@
+import pytest
+import os
+import tempfile
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import save_to_directory
+from expergen.store_utils import save_to_store, open_store, convert_directory_to_store
+
+class InnerConfig(BaseModel):
+    value: int = 0
+    tags: list = ["a", "b"]
+
+class StoreConfig(BaseModel):
+    name: str = "base"
+    inner: InnerConfig = InnerConfig()
+
+def test_save_and_open_store():
+    space = generate_variations(StoreConfig(), {"name": ["x", "y", "z"], "inner.value": list(range(5))})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert save_to_store(space, tmpdir, shard_size=4) == 15
+        assert sorted(f for f in os.listdir(tmpdir) if f.startswith("shard_")) == [f"shard_0000{i}.jsonl" for i in range(4)]
+
+        with open_store(tmpdir, StoreConfig) as store:
+            assert len(store) == 15
+            assert store[7] == space[7]
+            assert store[-1] == space[-1]
+            assert store[2:5] == list(space[2:5])
+            assert list(store) == list(space)
+            with pytest.raises(IndexError):
+                store[15]
+
+def test_save_to_store_replaces_existing_store():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_store([StoreConfig(name=str(i)) for i in range(10)], tmpdir, shard_size=2)
+        save_to_store([StoreConfig(name="only")], tmpdir, shard_size=2)
+
+        with open_store(tmpdir, StoreConfig) as store:
+            assert list(store) == [StoreConfig(name="only")]
+        assert not os.path.exists(os.path.join(tmpdir, "shard_00001.jsonl"))
+
+def test_failed_save_leaves_incomplete_store():
+    def configs():
+        yield StoreConfig(name="first")
+        raise RuntimeError("generator failed")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(RuntimeError):
+            save_to_store(configs(), tmpdir)
+        with pytest.raises(FileNotFoundError):
+            open_store(tmpdir, StoreConfig)
+
+def test_empty_store():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_store([], tmpdir)
+        store = open_store(tmpdir, StoreConfig)
+        assert len(store) == 0
+        assert list(store) == []
+
+def test_convert_directory_to_store():
+    instances = [StoreConfig(name=f"config{i}", inner=InnerConfig(value=i)) for i in range(12)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = os.path.join(tmpdir, "configs")
+        save_to_directory(instances, directory)
+        assert convert_directory_to_store(directory, os.path.join(tmpdir, "store"), shard_size=5) == 12
+
+        with open_store(os.path.join(tmpdir, "store"), StoreConfig) as store:
+            assert list(store) == instances
+            assert store[10] == instances[10]
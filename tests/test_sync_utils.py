@@ -0,0 +1,55 @@
+import os
+import tempfile
+from pydantic import BaseModel
+from expergen.dataclass_utils import generate_variations
+from expergen.json_utils import load_from_json, load_from_directory, save_to_directory
+from expergen.sync_utils import sync_directory
+
+class SyncedConfig(BaseModel):
+    learning_rate: float = 0.1
+    num_epochs: int = 10
+
+def test_sync_directory_keeps_identifiers_stable():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report = sync_directory(generate_variations(SyncedConfig(), {"num_epochs": [10, 20]}), tmpdir)
+        assert report.added == ["instance_1.json", "instance_2.json"]
+
+        os.utime(os.path.join(tmpdir, "instance_2.json"), (0, 0))
+        report = sync_directory(generate_variations(SyncedConfig(), {"num_epochs": [5, 20, 30]}), tmpdir)
+
+        assert report.added == ["instance_3.json", "instance_4.json"]
+        assert report.unchanged == ["instance_2.json"]
+        assert report.stale == ["instance_1.json"]
+        assert os.path.getmtime(os.path.join(tmpdir, "instance_2.json")) == 0
+        assert load_from_json(os.path.join(tmpdir, "instance_2.json"), SyncedConfig).num_epochs == 20
+        assert load_from_json(os.path.join(tmpdir, "instance_3.json"), SyncedConfig).num_epochs == 5
+        assert os.path.exists(os.path.join(tmpdir, "instance_1.json"))
+
+        report = sync_directory(generate_variations(SyncedConfig(), {"num_epochs": [5, 20, 30]}), tmpdir, remove_stale=True)
+        assert report.added == [] and report.stale == ["instance_1.json"]
+        assert [c.num_epochs for c in load_from_directory(tmpdir, SyncedConfig)] == [20, 5, 30]
+        assert not [f for f in os.listdir(tmpdir) if f.endswith(".tmp")]
+
+        report = sync_directory(generate_variations(SyncedConfig(), {"num_epochs": [5, 20, 30]}), tmpdir)
+        assert report.stale == [] and len(report.unchanged) == 3
+
+def test_sync_directory_does_not_overwrite_untracked_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        save_to_directory([SyncedConfig(num_epochs=1), SyncedConfig(num_epochs=2)], tmpdir)
+
+        report = sync_directory([SyncedConfig(num_epochs=3), SyncedConfig(num_epochs=3)], tmpdir)
+
+        assert report.added == ["instance_3.json"]
+        assert load_from_json(os.path.join(tmpdir, "instance_1.json"), SyncedConfig).num_epochs == 1
+
+def test_sync_directory_detects_in_place_edits():
+    configs = [SyncedConfig(num_epochs=1), SyncedConfig(num_epochs=2)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sync_directory(configs, tmpdir)
+        configs[1].learning_rate = 0.5
+        report = sync_directory(configs, tmpdir)
+
+        assert report.unchanged == ["instance_1.json"]
+        assert report.added == ["instance_3.json"]
+        assert report.stale == ["instance_2.json"]
+        assert load_from_json(os.path.join(tmpdir, "instance_3.json"), SyncedConfig) == configs[1]